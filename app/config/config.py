@@ -39,6 +39,12 @@ COUCHDB_URL = os.getenv("COUCHDB_URL", "http://localhost:5984")
 COUCHDB_USER = os.getenv("COUCHDB_USER", "admin")
 COUCHDB_PASSWORD = os.getenv("COUCHDB_PASSWORD", "admin")
 COUCHDB_DB = os.getenv("COUCHDB_DB", "ai_trainer")
+# Use Erlang views for hot workout queries (requires the server's native query server)
+COUCHDB_NATIVE_VIEWS = os.getenv("COUCHDB_NATIVE_VIEWS", "false").lower() == "true"
+# How much of the view index to build at startup: none, minimal or full
+VIEW_WARMUP_STRATEGY = os.getenv("VIEW_WARMUP_STRATEGY", "minimal").lower()
+# bcrypt cost factor for new password hashes; lower it only for tests/dev
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 # Log the values being set
 logger.info("Environment variables loaded:")
@@ -1,15 +1,37 @@
+import base64
+import copy
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import couchdb
+import numpy as np
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
-from app.config.config import COUCHDB_DB, COUCHDB_PASSWORD, COUCHDB_URL, COUCHDB_USER
+from app.config.config import (
+    COUCHDB_DB,
+    COUCHDB_NATIVE_VIEWS,
+    COUCHDB_PASSWORD,
+    COUCHDB_URL,
+    COUCHDB_USER,
+    VIEW_WARMUP_STRATEGY,
+)
 
-from .views import create_exercise_views, create_user_views, create_workout_views
+from .views import (
+    build_exercise_views,
+    build_native_workout_views,
+    build_user_views,
+    build_workout_views,
+    create_exercise_views,
+    create_native_workout_views,
+    create_user_views,
+    create_workout_views,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,8 +45,179 @@ logger.info(
 )
 logger.info(f"COUCHDB_DB: {COUCHDB_DB}")
 
+# One HTTP session for every Database instance so all of them draw keep-alive
+# connections from the same thread-safe pool
+_SESSION = couchdb.http.Session()
+
+# Shared worker threads for fanning out independent reads within a request,
+# so page loads don't pay for spinning up a fresh pool each time; pages use it
+# too rather than keeping pools of their own
+IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="db-io")
+
+# Exercise embeddings are stored as a float16 attachment rather than a JSON
+# array of floats, which keeps them out of document bodies and view rows.
+# Nothing reads the vectors back - search goes through the vector store - but
+# their presence marks which exercises are already embedded, so saving the
+# exercise list again doesn't pay for new embeddings.
+EMBEDDING_ATTACHMENT = "embedding.f16"
+
+
+# Mango query template for user lookups by username; callers fill in the
+# username on a copy. Served by the idx_user_profile_username index.
+USER_PROFILE_USERNAME_INDEX = "idx_user_profile_username"
+_USER_BY_USERNAME_QUERY = {
+    "selector": {"type": "user_profile", "username": None},
+    "limit": 1,
+    "use_index": USER_PROFILE_USERNAME_INDEX,
+}
+
+
+def _user_by_username_query(username: str) -> Dict[str, Any]:
+    return {
+        **_USER_BY_USERNAME_QUERY,
+        "selector": {**_USER_BY_USERNAME_QUERY["selector"], "username": username},
+    }
+
+
+# Serves per-user workout history queries by start time
+WORKOUT_USER_TIME_INDEX = "idx_workout_user_time"
+
+# Mango indexes created by Database.ensure_indexes
+REQUIRED_INDEXES = [
+    {
+        "index": {"fields": ["type", "username"]},
+        "name": USER_PROFILE_USERNAME_INDEX,
+        "type": "json",
+    },
+    {
+        "index": {"fields": ["hevy_id"]},
+        "name": "idx_hevy_id",
+        "type": "json",
+    },
+    {
+        "index": {"fields": ["type", "user_id", "start_time"]},
+        "name": WORKOUT_USER_TIME_INDEX,
+        "type": "json",
+    },
+]
+
+# Views queried on user request paths, warmed by the "minimal" strategy
+_HOT_VIEWS = [
+    "workouts/stats",
+    "workouts/by_user_day",
+    "workouts/by_hevy_id",
+    "exercises/by_hevy_id",
+]
+
+
+# Positions in the summed workouts/stats value array
+_STATS_FIELDS = (
+    "total_workouts",
+    "total_exercises",
+    "total_sets",
+    "total_weight",
+    "total_reps",
+    "total_duration",
+)
+
+
+def _stats_from_sums(sums: List[float]) -> Dict[str, Any]:
+    """Name the entries of a summed workouts/stats value.
+
+    Raises:
+        ValueError: If the value is not the summed array, which means the
+            database still has an older workouts/stats view installed
+    """
+    if not isinstance(sums, list) or len(sums) != len(_STATS_FIELDS):
+        raise ValueError(
+            f"workouts/stats returned {sums!r} instead of {len(_STATS_FIELDS)} "
+            "sums; the design documents are out of date, run "
+            "app/scripts/update_db_views.py"
+        )
+    return dict(zip(_STATS_FIELDS, sums))
+
+
+def _encode_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding vector into float16 bytes."""
+    return np.asarray(embedding, dtype=np.float16).tobytes()
+
+
+def _embedding_attachment(embedding: List[float]) -> Dict[str, str]:
+    """Inline _attachments entry carrying an encoded embedding."""
+    return {
+        "content_type": "application/octet-stream",
+        "data": base64.b64encode(_encode_embedding(embedding)).decode("ascii"),
+    }
+
+
+def _has_embedding(exercise: Dict[str, Any]) -> bool:
+    """Whether an exercise document carries an embedding in either format."""
+    if exercise.get("embedding") is not None:
+        return True
+    return EMBEDDING_ATTACHMENT in exercise.get("_attachments", {})
+
+
+def _exercise_from_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip CouchDB metadata (_id, _rev, _attachments) from an exercise doc."""
+    return {k: v for k, v in doc.items() if not k.startswith("_")}
+
 
 class Database:
+    # Databases already confirmed to exist in this process, so later
+    # connections can skip the existence round-trip.
+    _KNOWN_DBS: Set[str] = set()
+
+    # Design document serving workouts/by_date and workouts/by_user, resolved
+    # once per process (see _workout_view)
+    _workout_views_design: Optional[str] = None
+
+    # Whether ensure_indexes has run in this process
+    _indexes_ensured = False
+
+    # Short-lived cache for documents read by id, exercise hevy_id and
+    # username. It is shared by every instance so a write through any of them
+    # invalidates it; entries are copied in and out so callers can mutate the
+    # documents they get back.
+    _doc_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+    _doc_cache_lock = threading.Lock()
+    # Cache keys per document _id, so a write drops its entries without a
+    # scan. Evicted and expired keys linger until the index is rebuilt, which
+    # at worst costs a cache miss; guarded by _doc_cache_lock.
+    _doc_cache_keys: Dict[str, Set[Tuple[str, str]]] = {}
+
+    # Resolved exercise lists keyed by collection document id. Cleared on any
+    # exercise write; guarded by _doc_cache_lock.
+    _exercise_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+
+    # Hevy ids of every stored workout, loaded on first use and then kept
+    # current from the _changes feed, so new workouts need no lookup. The
+    # feed doesn't report deletions, so hits are confirmed against the view.
+    # None while the set is not loaded or the feed is down.
+    _known_workout_hevy_ids: Optional[Set[str]] = None
+    _known_workout_hevy_ids_lock = threading.Lock()
+    # Whether a thread is loading the set; the lock isn't held while it does
+    _known_workout_hevy_ids_loading = False
+
+    # Parsed last_sync_timestamp per user id, written through by
+    # update_last_sync_timestamp; guarded by _doc_cache_lock.
+    _last_sync: Dict[str, datetime] = {}
+
+    # Base exercises never go away once bootstrapped, so a True answer sticks
+    _base_exercises_bootstrapped = False
+
+    # Shared instance returned by Database.instance()
+    _instance: Optional["Database"] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "Database":
+        """Return the process-wide Database, creating it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
     def __init__(self):
         """Initialize the database connection."""
         try:
@@ -35,7 +228,7 @@ class Database:
                 # Production mode requires COUCHDB_URL
                 if not COUCHDB_URL:
                     raise ValueError("COUCHDB_URL is required for production mode.")
-                self.server = couchdb.Server(COUCHDB_URL)
+                self.server = couchdb.Server(COUCHDB_URL, session=_SESSION)
                 self.couchdb_url = COUCHDB_URL
                 logger.info(
                     f"Connecting to CouchDB in production mode at {COUCHDB_URL}"
@@ -51,7 +244,7 @@ class Database:
                     )
 
                 # Create server with credentials
-                self.server = couchdb.Server(full_url)
+                self.server = couchdb.Server(full_url, session=_SESSION)
                 self.server.resource.credentials = (COUCHDB_USER, COUCHDB_PASSWORD)
                 logger.info(
                     f"Connecting to CouchDB at {full_url} using user: {COUCHDB_USER}"
@@ -65,18 +258,21 @@ class Database:
 
             # Ensure database exists
             try:
-                if COUCHDB_DB in self.server:
-                    self.db = self.server[COUCHDB_DB]
+                if self._open_database():
                     logger.info(f"Connected to existing database: {COUCHDB_DB}")
+
+                    # Views changed in code must replace the stored ones
+                    # before any query reads them
+                    self.ensure_design_documents()
                 else:
-                    logger.info(f"Database {COUCHDB_DB} does not exist. Creating...")
-                    self.db = self.server.create(COUCHDB_DB)
                     logger.info(f"Created database: {COUCHDB_DB}")
 
                     # Create necessary design documents
                     self._create_design_documents()
                     logger.info("Created design documents")
 
+                self.ensure_indexes()
+
             except Exception as e:
                 logger.error(f"Error ensuring database exists: {e}")
                 raise
@@ -89,7 +285,7 @@ class Database:
         """Reconnect to CouchDB using stored URL and credentials."""
         try:
             logger.info(f"Reconnecting to CouchDB at {self.couchdb_url}")
-            self.server = couchdb.Server(self.couchdb_url)
+            self.server = couchdb.Server(self.couchdb_url, session=_SESSION)
 
             # Only set credentials if using local dev mode
             if COUCHDB_USER and COUCHDB_PASSWORD:
@@ -97,18 +293,71 @@ class Database:
                 logger.info(f"Using authentication with user: {COUCHDB_USER}")
 
             # Reconnect to existing database
-            if COUCHDB_DB in self.server:
-                self.db = self.server[COUCHDB_DB]
+            if self._open_database():
                 logger.info(f"Reconnected to database: {COUCHDB_DB}")
             else:
-                logger.info(f"Database {COUCHDB_DB} does not exist. Creating...")
-                self.db = self.server.create(COUCHDB_DB)
                 logger.info(f"Database {COUCHDB_DB} created successfully")
 
         except Exception as e:
             logger.error(f"Error reconnecting to CouchDB: {str(e)}")
             raise
 
+    def _open_database(self) -> bool:
+        """Bind self.db to COUCHDB_DB, creating the database if it is missing.
+
+        The existence check is a single HEAD request and is skipped entirely
+        once the database is known to exist in this process.
+
+        Returns:
+            bool: True if the database already existed, False if it was created
+        """
+        if COUCHDB_DB not in Database._KNOWN_DBS:
+            try:
+                self.server.resource.head(COUCHDB_DB)
+            except couchdb.http.ResourceNotFound:
+                logger.info(f"Database {COUCHDB_DB} does not exist. Creating...")
+                self.db = self.server.create(COUCHDB_DB)
+                Database._KNOWN_DBS.add(COUCHDB_DB)
+                return False
+            Database._KNOWN_DBS.add(COUCHDB_DB)
+
+        # Build the handle directly; server[name] would issue another HEAD
+        self.db = couchdb.Database(self.server.resource(COUCHDB_DB), COUCHDB_DB)
+        return True
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with Database._doc_cache_lock:
+            doc = Database._doc_cache.get(key)
+        return copy.deepcopy(doc) if doc is not None else None
+
+    def _cache_set(self, key: Tuple[str, str], doc: Dict[str, Any]) -> None:
+        doc = copy.deepcopy(doc)
+        with Database._doc_cache_lock:
+            Database._doc_cache[key] = doc
+            index = Database._doc_cache_keys
+            index.setdefault(doc.get("_id"), set()).add(key)
+            # Rebuild from the live entries once stale ids pile up
+            if len(index) > 2 * Database._doc_cache.maxsize:
+                index.clear()
+                for live_key, live_doc in Database._doc_cache.items():
+                    index.setdefault(live_doc.get("_id"), set()).add(live_key)
+
+    def _invalidate_cached(self, *doc_ids: Optional[str]) -> None:
+        """Drop every cache entry holding one of the given documents."""
+        doc_ids = {doc_id for doc_id in doc_ids if doc_id}
+        if not doc_ids:
+            return
+        with Database._doc_cache_lock:
+            for doc_id in doc_ids:
+                for key in Database._doc_cache_keys.pop(doc_id, ()):
+                    Database._doc_cache.pop(key, None)
+
+            if any(
+                doc_id.startswith(("exercise_", "base_exercises", "custom_exercises_"))
+                for doc_id in doc_ids
+            ):
+                Database._exercise_cache.clear()
+
     def _create_mock_database(self):
         """Create a mock database for development when CouchDB is not available."""
 
@@ -150,10 +399,133 @@ class Database:
             create_user_views(self.db)
             create_workout_views(self.db)
             create_exercise_views(self.db)
+            if COUCHDB_NATIVE_VIEWS:
+                create_native_workout_views(self.db)
+            self.ensure_indexes(force=True)
             logger.info("All design documents created successfully")
         except Exception as e:
             logger.error(f"Error creating design documents: {str(e)}")
 
+    def _design_documents(self) -> List[Dict[str, Any]]:
+        """Build every design document this version of the app expects."""
+        design_docs = [
+            build_user_views(),
+            build_workout_views(),
+            build_exercise_views(),
+        ]
+        if COUCHDB_NATIVE_VIEWS:
+            design_docs.append(build_native_workout_views())
+        return design_docs
+
+    def ensure_design_documents(self) -> bool:
+        """Upgrade the stored design documents if they differ from the code.
+
+        Design documents are only created with a new database, so an existing
+        deployment keeps serving old view definitions (such as the dict-valued
+        workouts/stats reduce, or no workouts/by_user_day at all) until they
+        are rewritten. This compares the stored views with the current ones in
+        one _all_docs request and runs recreate_all_design_documents when any
+        differ.
+
+        Returns:
+            True if the design documents were rewritten
+        """
+        try:
+            expected = self._design_documents()
+            stored = {
+                row.key: row.doc
+                for row in self.db.view(
+                    "_all_docs",
+                    keys=[doc["_id"] for doc in expected],
+                    include_docs=True,
+                )
+            }
+            stale = [
+                doc["_id"]
+                for doc in expected
+                if not stored.get(doc["_id"])
+                or stored[doc["_id"]].get("views") != doc["views"]
+                or stored[doc["_id"]].get("language") != doc.get("language")
+            ]
+            if not stale:
+                return False
+
+            logger.warning(
+                f"Design documents out of date, recreating: {', '.join(stale)}"
+            )
+            self.recreate_all_design_documents()
+            return True
+        except Exception as e:
+            logger.error(f"Error checking design documents: {str(e)}")
+            return False
+
+    def ensure_indexes(self, force: bool = False):
+        """Create the Mango indexes in REQUIRED_INDEXES.
+
+        CouchDB treats creating an existing index as a no-op, so this only
+        runs once per process unless forced.
+        """
+        if Database._indexes_ensured and not force:
+            return
+        try:
+            for index in REQUIRED_INDEXES:
+                self.db.resource.post_json("_index", body=index)
+                logger.info(f"Ensured Mango index {index['name']}")
+            Database._indexes_ensured = True
+        except Exception as e:
+            logger.error(f"Error creating Mango indexes: {str(e)}")
+
+    def warm_views(self, strategy: Optional[str] = None) -> Optional[threading.Thread]:
+        """Build view indexes in the background so the first user request
+        does not wait on CouchDB indexing.
+
+        Args:
+            strategy: "none", "minimal" (views on request paths) or "full"
+                (every view); defaults to VIEW_WARMUP_STRATEGY
+
+        Returns:
+            The warmup thread, or None if warmup is disabled
+        """
+        strategy = strategy or VIEW_WARMUP_STRATEGY
+        if strategy == "none":
+            return None
+
+        if strategy == "full":
+            design_docs = [
+                build_user_views(),
+                build_workout_views(),
+                build_exercise_views(),
+            ]
+            if COUCHDB_NATIVE_VIEWS:
+                design_docs.append(build_native_workout_views())
+            view_names = [
+                f"{doc['_id'][len('_design/'):]}/{view}"
+                for doc in design_docs
+                for view in doc["views"]
+            ]
+        else:
+            view_names = list(_HOT_VIEWS)
+
+        thread = threading.Thread(
+            target=self._warm_views, args=(view_names,), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _warm_views(self, view_names: List[str]) -> None:
+        def warm(view_name: str) -> None:
+            try:
+                # limit=0 returns no rows but still brings the index up to date
+                list(self.db.view(view_name, limit=0))
+            except Exception as e:
+                logger.warning(f"Error warming view {view_name}: {str(e)}")
+
+        started = datetime.now(timezone.utc)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(warm, view_names))
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        logger.info(f"Warmed {len(view_names)} views in {elapsed:.1f}s")
+
     def recreate_workouts_design_document(self):
         """Recreate the workouts design document to update views using centralized view function."""
         try:
@@ -181,23 +553,82 @@ class Database:
             logger.error(f"Error recreating exercises design document: {str(e)}")
 
     def recreate_all_design_documents(self):
-        """Recreate all design documents (users, workouts, exercises) using centralized view functions."""
+        """Recreate all design documents (users, workouts, exercises) using centralized view functions.
+
+        Current revisions are read with one _all_docs request and the new
+        design documents are written over them with one _bulk_docs request.
+        """
         try:
-            # Delete existing design docs if they exist
-            for design in ["users", "workouts", "exercises"]:
-                doc_id = f"_design/{design}"
-                if doc_id in self.db:
-                    logger.info(f"Deleting existing {design} design document")
-                    doc = self.db[doc_id]
-                    self.db.delete(doc)
-            # Recreate all design docs
-            create_user_views(self.db)
-            create_workout_views(self.db)
-            create_exercise_views(self.db)
+            design_docs = self._design_documents()
+            native_id = "_design/workouts_native"
+
+            # Look up current revisions in one request
+            doc_ids = [doc["_id"] for doc in design_docs]
+            if not COUCHDB_NATIVE_VIEWS:
+                doc_ids.append(native_id)
+            current_revs = {}
+            for row in self.db.view("_all_docs", keys=doc_ids):
+                if row.value and not row.value.get("deleted"):
+                    current_revs[row.key] = row.value["rev"]
+
+            for doc in design_docs:
+                if doc["_id"] in current_revs:
+                    doc["_rev"] = current_revs[doc["_id"]]
+
+            # Native views were switched off: delete the stale design doc
+            if native_id in current_revs and not COUCHDB_NATIVE_VIEWS:
+                design_docs.append(
+                    {
+                        "_id": native_id,
+                        "_rev": current_revs[native_id],
+                        "_deleted": True,
+                    }
+                )
+
+            # The by_date view reads exercise_count without a fallback
+            self.backfill_workout_exercise_counts()
+
+            for success, doc_id, result in self.db.update(design_docs):
+                if not success:
+                    logger.error(f"Error writing design document {doc_id}: {result}")
+
+            Database._workout_views_design = None
+            self.ensure_indexes(force=True)
             logger.info("All design documents recreated successfully")
         except Exception as e:
             logger.error(f"Error recreating all design documents: {str(e)}")
 
+    def backfill_workout_exercise_counts(self) -> int:
+        """Set exercise_count on workout documents written without one.
+
+        Returns:
+            Number of workouts updated
+        """
+        query = {
+            "selector": {"type": "workout", "exercise_count": {"$exists": False}},
+            "limit": 1000,
+        }
+        updated = 0
+        try:
+            while True:
+                _, _, page = self.db.resource.post_json("_find", body=query)
+                docs = page.get("docs", [])
+                if not docs:
+                    break
+                for doc in docs:
+                    doc["exercise_count"] = len(doc.get("exercises") or [])
+                self._bulk_update(docs)
+                updated += len(docs)
+                # Updated documents drop out of the selector, so only page on
+                # when some were left behind
+                if len(docs) < query["limit"]:
+                    break
+            if updated:
+                logger.info(f"Backfilled exercise_count on {updated} workouts")
+        except Exception as e:
+            logger.error(f"Error backfilling workout exercise counts: {str(e)}")
+        return updated
+
     def save_document(
         self, doc: Dict[str, Any], doc_id: Optional[str] = None
     ) -> Tuple[str, str]:
@@ -217,6 +648,7 @@ class Database:
 
             # Save the document
             doc_id, doc_rev = self.db.save(doc)
+            self._invalidate_cached(doc_id)
             logger.info(f"Document saved successfully. ID: {doc_id}, Rev: {doc_rev}")
             return doc_id, doc_rev
         except Exception as e:
@@ -227,6 +659,40 @@ class Database:
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
 
+    def save_raw(
+        self, payload: bytes, doc_id: Optional[str] = None, rev: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Save an already serialized JSON document.
+
+        Skips the dict walk and JSON encoding done by save_document, for
+        models that can dump themselves straight to JSON.
+
+        Args:
+            payload: JSON document body
+            doc_id: Document ID; CouchDB assigns one when omitted
+            rev: Current revision, required when updating an existing document
+
+        Returns:
+            Tuple of (doc_id, doc_rev)
+        """
+        try:
+            headers = {"Content-Type": "application/json"}
+            if doc_id:
+                params = {"rev": rev} if rev else {}
+                _, _, data = self.db.resource.put_json(
+                    doc_id, body=payload, headers=headers, **params
+                )
+            else:
+                _, _, data = self.db.resource.post_json(body=payload, headers=headers)
+            self._invalidate_cached(data["id"])
+            logger.info(
+                f"Document saved successfully. ID: {data['id']}, Rev: {data['rev']}"
+            )
+            return data["id"], data["rev"]
+        except Exception as e:
+            logger.error(f"Error saving document: {str(e)}")
+            raise
+
     def _ensure_json_serializable(self, obj: Any) -> Any:
         """Ensure an object is JSON serializable."""
         if isinstance(obj, dict):
@@ -245,8 +711,13 @@ class Database:
     def get_document(self, doc_id):
         """Retrieve a document by ID."""
         try:
+            cached = self._cache_get(("doc", doc_id))
+            if cached is not None:
+                return cached
+
             logger.info(f"Retrieving document: {doc_id}")
             doc = self.db[doc_id]
+            self._cache_set(("doc", doc_id), doc)
             logger.info(f"Document retrieved successfully: {doc_id}")
             return doc
         except couchdb.http.ResourceNotFound:
@@ -258,13 +729,16 @@ class Database:
 
     def update_document(self, doc):
         """Update an existing document."""
-        return self.db.save(doc)
+        result = self.db.save(doc)
+        self._invalidate_cached(doc.get("_id"))
+        return result
 
     def delete_document(self, doc_id):
         """Delete a document by ID."""
         try:
             doc = self.db[doc_id]
             self.db.delete(doc)
+            self._invalidate_cached(doc_id)
             return True
         except couchdb.http.ResourceNotFound:
             return False
@@ -288,18 +762,44 @@ class Database:
 
         return self.db.save(design_doc)
 
+    def _workout_view(self, view_name: str) -> str:
+        """Return the qualified name of a hot workout view (by_date, by_user).
+
+        With COUCHDB_NATIVE_VIEWS enabled the Erlang copies in
+        _design/workouts_native are used, provided the server can run them;
+        otherwise, or if the probe fails, the JavaScript views are used.
+        """
+        if Database._workout_views_design is None:
+            design = "workouts"
+            if COUCHDB_NATIVE_VIEWS:
+                try:
+                    if "_design/workouts_native" not in self.db:
+                        create_native_workout_views(self.db)
+                    list(self.db.view("workouts_native/by_date", limit=1))
+                    design = "workouts_native"
+                    logger.info("Using native Erlang workout views")
+                except Exception as e:
+                    logger.warning(
+                        f"Native workout views unavailable, using JavaScript views: {str(e)}"
+                    )
+            Database._workout_views_design = design
+        return f"{Database._workout_views_design}/{view_name}"
+
     def get_all_workouts(self) -> List[Dict[str, Any]]:
         """Retrieve all workout documents across all users."""
         try:
             return [
-                row.doc for row in self.db.view("workouts/by_date", include_docs=True)
+                row.doc
+                for row in self.db.view(
+                    self._workout_view("by_date"), include_docs=True
+                )
             ]
         except Exception as e:
             logger.error(f"Error fetching all workouts: {str(e)}")
             return []
 
-    def get_workouts_by_date_range(self, start_date, end_date):
-        """Get workouts within a date range."""
+    def get_workouts_by_date_range(self, user_id, start_date, end_date):
+        """Get a user's workouts within a date range."""
         try:
             # Convert dates to ISO format if they aren't already
             if isinstance(start_date, datetime):
@@ -307,11 +807,12 @@ class Database:
             if isinstance(end_date, datetime):
                 end_date = end_date.isoformat()
 
-            # Query the view
+            # The by_user view is keyed by [user_id, start_time], so only
+            # this user's workouts are read
             result = self.db.view(
-                "workouts/by_date",
-                startkey=start_date,
-                endkey=end_date,
+                self._workout_view("by_user"),
+                startkey=[user_id, start_date],
+                endkey=[user_id, end_date],
                 include_docs=True,
             )
 
@@ -319,9 +820,70 @@ class Database:
             workouts = [row.doc for row in result]
             return workouts
         except Exception as e:
-            print(f"Error getting workouts by date range: {e}")
+            logger.error(
+                f"Error getting workouts by date range: {str(e)}", exc_info=True
+            )
             return []
 
+    def get_workout_days(
+        self,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Count a user's workouts per day, optionally within a date range.
+
+        The by_user_day view is reduced on the server, so one small row comes
+        back per day with workouts instead of the workouts themselves.
+
+        Args:
+            user_id (str): User ID
+            start_date (datetime, optional): Start of the range
+            end_date (datetime, optional): End of the range
+
+        Returns:
+            Dict[str, int]: Workout count per YYYY-MM-DD day, in date order
+        """
+        if start_date and end_date:
+            startkey = [user_id, start_date.date().isoformat()]
+            endkey = [user_id, end_date.date().isoformat()]
+        else:
+            startkey = [user_id]
+            endkey = [user_id, {}]
+
+        try:
+            return {
+                row.key[1]: row.value
+                for row in self.db.view(
+                    "workouts/by_user_day",
+                    startkey=startkey,
+                    endkey=endkey,
+                    group_level=2,
+                )
+            }
+        except Exception as e:
+            logger.error(f"Error getting workout days: {str(e)}")
+            return {}
+
+    def get_dashboard_bundle(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get the workout numbers the dashboard shows, from a single view query.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            Dict[str, Any]: total_workouts, last_workout_date (YYYY-MM-DD or
+            None) and workout_days (workout count per day, in date order)
+        """
+        workout_days = self.get_workout_days(user_id)
+        return {
+            "total_workouts": sum(workout_days.values()),
+            "last_workout_date": next(reversed(workout_days), None),
+            "workout_days": workout_days,
+        }
+
     def get_workouts_by_exercise(self, exercise_template_id: str):
         """Get all workouts containing a specific exercise."""
         return [
@@ -345,51 +907,38 @@ class Database:
             return val
 
         if start_date and end_date:
-            result = list(
-                self.db.view(
-                    "workouts/stats",
-                    startkey=[user_id, to_iso(start_date)],
-                    endkey=[user_id, to_iso(end_date)],
-                    reduce=True,
-                    group_level=2,
-                )
-            )
-            # Sum the values in Python
-            total_duration = 0
-            total_exercises = 0
-            total_workouts = 0
-            last_workout_date = None
-
-            for row in result:
-                val = row.value
-                total_duration += val.get("total_duration", 0)
-                total_exercises += val.get("total_exercises", 0)
-                total_workouts += val.get("total_workouts", 0)
-                lw = val.get("last_workout_date")
-                if lw and (not last_workout_date or lw > last_workout_date):
-                    last_workout_date = lw
-            logger.info(
-                f"Workout stats (get_workout_stats): {total_duration}, {total_exercises}, {total_workouts}, {last_workout_date}"
-            )
-            return [
-                {
-                    "total_duration": total_duration,
-                    "total_exercises": total_exercises,
-                    "total_workouts": total_workouts,
-                    "last_workout_date": last_workout_date,
-                }
-            ]
-        # If no date range, get all stats for the user
+            startkey = [user_id, to_iso(start_date)]
+            endkey = [user_id, to_iso(end_date)]
+        else:
+            # If no date range, get all stats for the user
+            startkey = [user_id]
+            endkey = [user_id, {}]
+
+        # _sum collapses the whole key range into a single row
         result = list(
+            self.db.view(
+                "workouts/stats", startkey=startkey, endkey=endkey, reduce=True
+            )
+        )
+        if not result:
+            return []
+
+        stats = _stats_from_sums(result[0].value)
+        # Keys sort by start time, so the latest workout is the first row
+        # when reading the range backwards
+        latest = list(
             self.db.view(
                 "workouts/stats",
-                startkey=[user_id],
-                endkey=[user_id, {}],
-                reduce=True,
-                group_level=1,
+                startkey=endkey,
+                endkey=startkey,
+                descending=True,
+                reduce=False,
+                limit=1,
             )
         )
-        return [row.value for row in result]
+        stats["last_workout_date"] = latest[0].key[1] if latest else None
+        logger.info(f"Workout stats (get_workout_stats): {stats}")
+        return [stats]
 
     def get_workout_progression(self, exercise_template_id: str):
         """Get progression data for a specific exercise."""
@@ -407,9 +956,12 @@ class Database:
     def get_user_by_username(self, username: str) -> Optional[dict]:
         """Get a user by username."""
         try:
+            cached = self._cache_get(("username", username))
+            if cached is not None:
+                return cached
+
             # Use Mango query to find user by username
-            query = {"selector": {"type": "user_profile", "username": username}}
-            result = self.db.find(query)
+            result = self.db.find(_user_by_username_query(username))
             for doc in result:
                 # Fix preferred_workout_days if it's a list
                 # TODO: Remove this once we've confirmed that the data is normalized
@@ -421,6 +973,7 @@ class Database:
                     logging.info(
                         f"Converted preferred_workout_days from list to integer: {doc['preferred_workout_days']}"
                     )
+                self._cache_set(("username", username), doc)
                 return doc
             return None
         except Exception as e:
@@ -431,8 +984,7 @@ class Database:
         """Check if a username already exists."""
         try:
             # Use Mango query to find user by username
-            query = {"selector": {"type": "user_profile", "username": username}}
-            result = self.db.find(query)
+            result = self.db.find(_user_by_username_query(username))
             # Check if any results were returned
             return any(True for _ in result)
         except Exception as e:
@@ -472,7 +1024,9 @@ class Database:
             user_doc = self.db[user_id]
             user_doc["hevy_api_key"] = api_key
             user_doc["hevy_api_key_updated_at"] = datetime.now(timezone.utc).isoformat()
-            return self.db.save(user_doc)
+            result = self.db.save(user_doc)
+            self._invalidate_cached(user_id)
+            return result
         except couchdb.http.ResourceNotFound:
             return None
 
@@ -500,16 +1054,31 @@ class Database:
             logger.info(f"Getting workout history for user {user_id}")
             logger.info(f"Date range: {start_date} to {end_date}")
 
-            # Query workouts within date range using the by_user view
-            results = self.db.view(
-                "workouts/by_user",
-                startkey=[user_id, start_date.isoformat()],
-                endkey=[user_id, end_date.isoformat()],
-                include_docs=True,
-            )
-
-            # Convert to list and log count
-            workout_list = [row.doc for row in results]
+            # Query workouts within date range through the (type, user_id,
+            # start_time) Mango index, paging with bookmarks
+            query = {
+                "selector": {
+                    "type": "workout",
+                    "user_id": user_id,
+                    "start_time": {
+                        "$gte": start_date.isoformat(),
+                        "$lte": end_date.isoformat(),
+                    },
+                },
+                "sort": [{"type": "asc"}, {"user_id": "asc"}, {"start_time": "asc"}],
+                "use_index": WORKOUT_USER_TIME_INDEX,
+                "limit": 1000,
+            }
+            workout_list = []
+            while True:
+                _, _, page = self.db.resource.post_json("_find", body=query)
+                docs = page.get("docs", [])
+                workout_list.extend(docs)
+                if len(docs) < query["limit"]:
+                    break
+                query["bookmark"] = page["bookmark"]
+
+            # Log count
             logger.info(
                 f"Found {len(workout_list)} workouts for user {user_id} in date range {start_date} to {end_date}"
             )
@@ -519,6 +1088,42 @@ class Database:
             logger.error(f"Error getting workout history: {str(e)}")
             return []
 
+    def get_ai_recs_context(self, user_id: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Get what the AI recommendations page shows for a user.
+
+        The three lookups are independent, so they run concurrently and the
+        page waits for the slowest one instead of all three in turn.
+
+        Args:
+            user_id: User ID
+            days: How many days of workout history to include
+
+        Returns:
+            Dict with the user document ("profile", None if missing), the
+            summed "workout_stats" for the period (None without workouts) and
+            the number of available exercises ("exercise_count")
+        """
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        profile = IO_POOL.submit(self.get_document, user_id)
+        workout_stats = IO_POOL.submit(
+            self.get_workout_stats, user_id, start_date, end_date
+        )
+        exercise_count = IO_POOL.submit(
+            self.count_exercises, user_id=user_id, include_custom=True
+        )
+        try:
+            stats = next(iter(workout_stats.result()), None)
+        except Exception as e:
+            logger.error(f"Error getting workout stats: {str(e)}")
+            stats = None
+        return {
+            "profile": profile.result(),
+            "workout_stats": stats,
+            "exercise_count": exercise_count.result(),
+        }
+
     def save_exercise(self, exercise_data: Dict[str, Any]) -> str:
         """
         Save an exercise to the database.
@@ -532,39 +1137,56 @@ class Database:
         try:
             # logger.info(f"Saving exercise type: {type(exercise_data)}")
             exercise_name = exercise_data.get("title", "Unknown")
-            has_embedding = "embedding" in exercise_data
+            has_embedding = exercise_data.get("embedding") is not None
             # logger.info(
             #     f"Saving exercise: {exercise_name} (Has embedding: {has_embedding})"
             # )
 
+            # The embedding is stored as an attachment, not in the document body
+            doc = {k: v for k, v in exercise_data.items() if k != "embedding"}
+            embedding = exercise_data.get("embedding")
+
             # Check if exercise already exists by hevy_id
             if "hevy_id" in exercise_data:
                 existing = self.get_exercise_by_hevy_id(exercise_data["hevy_id"])
                 if existing:
                     # Update existing exercise
-                    exercise_data["_id"] = existing["_id"]
-                    exercise_data["_rev"] = existing["_rev"]
+                    doc["_id"] = existing["_id"]
+                    doc["_rev"] = existing["_rev"]
+                    # Keep attachment stubs, otherwise the update drops them
+                    if "_attachments" in existing:
+                        doc["_attachments"] = existing["_attachments"]
                     # logger.info(
                     #     f"Updating existing exercise: {exercise_name} (ID: {existing['_id']})"
                     # )
 
                     # Check if we're preserving the embedding
-                    if has_embedding and "embedding" not in existing:
+                    if has_embedding and not _has_embedding(existing):
                         logger.info(
                             f"Adding embedding to existing exercise: {exercise_name}"
                         )
-                    elif has_embedding and "embedding" in existing:
+                    elif has_embedding and _has_embedding(existing):
                         logger.info(
                             f"Updating embedding for existing exercise: {exercise_name}"
                         )
-                    elif not has_embedding and "embedding" in existing:
+                    elif not has_embedding and existing.get("embedding") is not None:
+                        # Legacy inline embedding: move it into the attachment
                         logger.info(
                             f"Preserving existing embedding for exercise: {exercise_name}"
                         )
-                        exercise_data["embedding"] = existing["embedding"]
+                        embedding = existing["embedding"]
+
+            if embedding is not None:
+                doc["_attachments"] = {
+                    **doc.get("_attachments", {}),
+                    EMBEDDING_ATTACHMENT: _embedding_attachment(embedding),
+                }
 
             # Save to database
-            doc_id, _ = self.db.save(exercise_data)
+            doc_id, _ = self.db.save(doc)
+            self._invalidate_cached(doc_id)
+            with Database._doc_cache_lock:
+                Database._exercise_cache.clear()
             # logger.info(
             #     f"Saved exercise with ID: {doc_id} (Has embedding: {'embedding' in exercise_data})"
             # )
@@ -584,15 +1206,20 @@ class Database:
             Exercise document if found, None otherwise
         """
         try:
+            cached = self._cache_get(("exercise_hevy_id", hevy_id))
+            if cached is not None:
+                return cached
+
             results = self.db.view(
                 "exercises/by_hevy_id", key=hevy_id, include_docs=True
             )
             for row in results:
                 exercise = row.doc
-                has_embedding = "embedding" in exercise
+                has_embedding = _has_embedding(exercise)
                 logger.info(
                     f"Retrieved exercise by Hevy ID {hevy_id}: {exercise.get('title', 'Unknown')} (Has embedding: {has_embedding})"
                 )
+                self._cache_set(("exercise_hevy_id", hevy_id), exercise)
                 return exercise
             logger.info(f"No exercise found with Hevy ID: {hevy_id}")
             return None
@@ -632,15 +1259,15 @@ class Database:
             List of all exercise documents
         """
         try:
-            exercises = []
-
-            # First try to get individual exercise documents from the view
-            individual_exercises = [
-                row.doc for row in self.db.view("exercises/all", include_docs=True)
+            # Individual exercise documents; custom ones only for this user
+            exercises = [
+                _exercise_from_doc(row.doc)
+                for row in self.db.view("exercises/all", include_docs=True)
+                if row.doc.get("user_id") in (None, user_id)
             ]
-            exercises.extend(individual_exercises)
 
-            # Get base exercises from base_exercises document
+            # Collections written before the per-exercise layout still hold
+            # their exercises in an array
             base_doc = self.get_document("base_exercises")
             if base_doc and base_doc.get("exercises"):
                 exercises.extend(base_doc["exercises"])
@@ -655,17 +1282,14 @@ class Database:
                         f"Retrieved {len(custom_doc['exercises'])} custom exercises for user {user_id}"
                     )
 
-            # Remove duplicates based on exercise ID
-            seen_ids = set()
-            unique_exercises = []
+            # Remove duplicates based on exercise ID (first occurrence wins)
+            unique_exercises = {}
             for exercise in exercises:
-                exercise_id = exercise.get("id") or exercise.get("hevy_id")
-                if exercise_id and exercise_id not in seen_ids:
-                    seen_ids.add(exercise_id)
-                    unique_exercises.append(exercise)
+                if exercise_id := exercise.get("id") or exercise.get("hevy_id"):
+                    unique_exercises.setdefault(exercise_id, exercise)
 
             logger.info(f"Retrieved {len(unique_exercises)} total unique exercises")
-            return unique_exercises
+            return list(unique_exercises.values())
         except Exception as e:
             logger.error(f"Error getting all exercises: {str(e)}")
             return []
@@ -679,6 +1303,9 @@ class Database:
         """
         Save a workout to the database.
 
+        Use save_workouts_batch (or save_user_workouts) when saving several
+        workouts; this makes one request per workout.
+
         Args:
             workout_data: Workout data to save
             doc_id: Optional document ID to use
@@ -718,12 +1345,25 @@ class Database:
                     # logger.info(f"Updating existing workout with ID: {existing['_id']}")
 
             # Ensure exercise_count is set
-            if "exercise_count" not in workout_data and "exercises" in workout_data:
-                workout_data["exercise_count"] = len(workout_data["exercises"])
+            if "exercise_count" not in workout_data:
+                workout_data["exercise_count"] = len(workout_data.get("exercises", []))
                 logger.info(f"Set exercise_count to: {workout_data['exercise_count']}")
 
+            # Store the duration so views don't have to parse the timestamps
+            if workout_data.get("duration_minutes") is None:
+                try:
+                    start = datetime.fromisoformat(workout_data["start_time"])
+                    end = datetime.fromisoformat(workout_data["end_time"])
+                    workout_data["duration_minutes"] = int(
+                        (end - start).total_seconds() / 60
+                    )
+                except (KeyError, TypeError, ValueError):
+                    pass
+
             # Save to database
             doc_id, _ = self.db.save(workout_data)
+            self._invalidate_cached(doc_id)
+            self._remember_workout_hevy_ids(workout_data.get("hevy_id"))
             logger.info(f"Saved workout with ID: {doc_id}")
             return doc_id
         except Exception as e:
@@ -745,11 +1385,10 @@ class Database:
             Workout document if found, None otherwise
         """
         try:
-            results = self.db.view(
-                "workouts/by_hevy_id", key=hevy_id, include_docs=True
-            )
+            # by_hevy_id emits the whole document, so read it from the row value
+            results = self.db.view("workouts/by_hevy_id", key=hevy_id, limit=1)
             for row in results:
-                return row.doc
+                return row.value
             return None
         except Exception as e:
             logger.error(f"Error getting workout by Hevy ID: {str(e)}")
@@ -766,33 +1405,147 @@ class Database:
         Returns:
             Set of Hevy IDs that already exist in the database
         """
+        keys = list(dict.fromkeys(hevy_id for hevy_id in hevy_ids if hevy_id))
+        if not keys:
+            return set()
+
+        # The known set rules out new workouts without a request. Deletions
+        # never reach it, so its hits are confirmed against the view and any
+        # that are gone are dropped from the set.
+        known_ids = self._get_known_workout_hevy_ids()
+        if known_ids is not None:
+            with Database._known_workout_hevy_ids_lock:
+                candidates = known_ids.intersection(keys)
+            if not candidates:
+                logger.info(f"Found 0 existing workouts out of {len(keys)} checked")
+                return set()
+            try:
+                results = self.db.view("workouts/by_hevy_id", keys=list(candidates))
+                existing_ids = {row.key for row in results}
+                with Database._known_workout_hevy_ids_lock:
+                    known_ids.difference_update(candidates - existing_ids)
+                logger.info(
+                    f"Found {len(existing_ids)} existing workouts out of {len(keys)} checked"
+                )
+                return existing_ids
+            except Exception as e:
+                logger.error(f"Error confirming existing workout IDs: {str(e)}")
+                keys = list(candidates)
+
         existing_ids = set()
         try:
             # Use bulk query to check multiple IDs at once
             # CouchDB views support multiple keys in a single query
-            results = self.db.view(
-                "workouts/by_hevy_id", keys=hevy_ids, include_docs=False
-            )
-            for row in results:
-                existing_ids.add(row.key)
+            results = self.db.view("workouts/by_hevy_id", keys=keys)
+            existing_ids = {row.key for row in results}
             logger.info(
-                f"Found {len(existing_ids)} existing workouts out of {len(hevy_ids)} checked"
+                f"Found {len(existing_ids)} existing workouts out of {len(keys)} checked"
             )
         except Exception as e:
+            # Only a failed request gets here; zero rows is a valid answer.
+            # Retry in smaller batches rather than one query per workout.
             logger.error(f"Error getting existing workout IDs: {str(e)}")
-            # Fallback to individual queries if bulk query fails
-            logger.info("Falling back to individual workout checks...")
-            for hevy_id in hevy_ids:
+            logger.info("Falling back to batched workout checks...")
+            batch_size = 100
+            for i in range(0, len(keys), batch_size):
+                batch = keys[i : i + batch_size]
                 try:
-                    if self.get_workout_by_hevy_id(hevy_id):
-                        existing_ids.add(hevy_id)
-                except Exception as individual_error:
+                    results = self.db.view("workouts/by_hevy_id", keys=batch)
+                    existing_ids.update(row.key for row in results)
+                except Exception as batch_error:
                     logger.error(
-                        f"Error checking individual workout {hevy_id}: {individual_error}"
+                        f"Error checking workouts {batch[0]}..{batch[-1]}: {batch_error}"
                     )
 
         return existing_ids
 
+    def _get_known_workout_hevy_ids(self) -> Optional[Set[str]]:
+        """
+        Get the set of stored workout Hevy IDs, loading it on first use.
+
+        The ids are read with paged _find requests that only return the
+        hevy_id field, then a background thread follows the _changes feed
+        from the sequence the load started at. Returns None if the set could
+        not be loaded or another thread is still loading it, in which case
+        callers should query the database directly.
+        """
+        with Database._known_workout_hevy_ids_lock:
+            if (
+                Database._known_workout_hevy_ids is not None
+                or Database._known_workout_hevy_ids_loading
+            ):
+                # None while another thread loads it; callers query directly
+                return Database._known_workout_hevy_ids
+            Database._known_workout_hevy_ids_loading = True
+
+        # Load without holding the lock, so saves and other syncs don't wait
+        # on paging through every workout
+        try:
+            # Read the sequence first so no write after it is missed
+            since = self.db.info()["update_seq"]
+            known_ids = set()
+            query = {
+                "selector": {"type": "workout", "hevy_id": {"$gt": None}},
+                "fields": ["hevy_id"],
+                "limit": 10000,
+            }
+            while True:
+                _, _, page = self.db.resource.post_json("_find", body=query)
+                docs = page.get("docs", [])
+                known_ids.update(doc["hevy_id"] for doc in docs)
+                if len(docs) < query["limit"]:
+                    break
+                query["bookmark"] = page["bookmark"]
+            logger.info(f"Loaded {len(known_ids)} known workout Hevy IDs")
+        except Exception as e:
+            logger.error(f"Error loading known workout Hevy IDs: {str(e)}")
+            with Database._known_workout_hevy_ids_lock:
+                Database._known_workout_hevy_ids_loading = False
+            return None
+
+        with Database._known_workout_hevy_ids_lock:
+            Database._known_workout_hevy_ids = known_ids
+            Database._known_workout_hevy_ids_loading = False
+        threading.Thread(
+            target=self._follow_workout_changes,
+            args=(since,),
+            name="workout-changes",
+            daemon=True,
+        ).start()
+        return known_ids
+
+    def _follow_workout_changes(self, since: Any) -> None:
+        """Add workouts written by any client to the known Hevy ID set.
+
+        Runs until the continuous feed fails or closes; the set is then
+        dropped so the next lookup reloads it and starts a new follower.
+        """
+        try:
+            for change in self.db.changes(
+                feed="continuous",
+                since=since,
+                filter="_view",
+                view="workouts/by_hevy_id",
+                include_docs=True,
+                heartbeat=30000,
+            ):
+                hevy_id = (change.get("doc") or {}).get("hevy_id")
+                if hevy_id and not change.get("deleted"):
+                    self._remember_workout_hevy_ids(hevy_id)
+            logger.warning("Workout changes feed closed")
+        except Exception as e:
+            logger.error(f"Error following workout changes: {str(e)}")
+        with Database._known_workout_hevy_ids_lock:
+            Database._known_workout_hevy_ids = None
+
+    def _remember_workout_hevy_ids(self, *hevy_ids: Optional[str]) -> None:
+        """Add newly written workouts to the known-id set, if it is loaded."""
+        with Database._known_workout_hevy_ids_lock:
+            if Database._known_workout_hevy_ids is not None:
+                Database._known_workout_hevy_ids.update(
+                    hevy_id for hevy_id in hevy_ids if hevy_id
+                )
+
     def are_base_exercises_bootstrapped(self) -> bool:
         """
         Check if base exercises have already been bootstrapped.
@@ -800,14 +1553,23 @@ class Database:
         Returns:
             True if base exercises exist, False otherwise
         """
+        if Database._base_exercises_bootstrapped:
+            return True
         try:
             base_exercises_doc = self.get_document("base_exercises")
-            if base_exercises_doc and base_exercises_doc.get("exercises"):
-                exercise_count = len(base_exercises_doc.get("exercises", []))
+            if base_exercises_doc and (
+                base_exercises_doc.get("exercise_ids")
+                or base_exercises_doc.get("exercises")
+            ):
+                exercise_count = len(
+                    base_exercises_doc.get("exercise_ids")
+                    or base_exercises_doc["exercises"]
+                )
                 logger.info(
                     f"Found {exercise_count} base exercises already bootstrapped"
                 )
-                return exercise_count > 0
+                Database._base_exercises_bootstrapped = exercise_count > 0
+                return Database._base_exercises_bootstrapped
             return False
         except Exception as e:
             logger.error(f"Error checking base exercises bootstrap status: {e}")
@@ -823,10 +1585,18 @@ class Database:
         Returns:
             Last sync timestamp or None if no previous sync
         """
+        with Database._doc_cache_lock:
+            cached = Database._last_sync.get(user_id)
+        if cached is not None:
+            return cached
+
         try:
             user_doc = self.get_document(user_id)
             if user_doc and user_doc.get("last_sync_timestamp"):
-                return datetime.fromisoformat(user_doc["last_sync_timestamp"])
+                timestamp = datetime.fromisoformat(user_doc["last_sync_timestamp"])
+                with Database._doc_cache_lock:
+                    Database._last_sync[user_id] = timestamp
+                return timestamp
             return None
         except Exception as e:
             logger.error(f"Error getting last sync timestamp: {e}")
@@ -845,47 +1615,89 @@ class Database:
             if user_doc:
                 user_doc["last_sync_timestamp"] = timestamp.isoformat()
                 self.save_document(user_doc)
+                with Database._doc_cache_lock:
+                    Database._last_sync[user_id] = timestamp
                 logger.info(
                     f"Updated last sync timestamp for user {user_id}: {timestamp.isoformat()}"
                 )
         except Exception as e:
             logger.error(f"Error updating last sync timestamp: {e}")
 
-    def save_workouts_batch(self, workouts: List[Dict[str, Any]]) -> None:
+    def save_workouts_batch(self, workouts: List[Dict[str, Any]]) -> List[str]:
         """
         Save multiple workouts in a single batch operation.
         This is more efficient than saving workouts individually.
 
         Args:
             workouts: List of workout data dictionaries to save
+
+        Returns:
+            Document IDs of the workouts that were saved
         """
         if not workouts:
-            return
+            return []
 
         try:
+            # Current revisions (and creation times) of workouts that are
+            # already stored, looked up in one request so updates don't
+            # conflict. The view is keyed by hevy_id, so workouts saved under
+            # older generated ids are updated in place too.
+            hevy_ids = [w["hevy_id"] for w in workouts if w.get("hevy_id")]
+            existing = {}
+            if hevy_ids:
+                for row in self.db.view("workouts/by_hevy_id", keys=hevy_ids):
+                    existing[row.key] = row.value
+
             # Prepare documents for bulk save
+            now_iso = datetime.now(timezone.utc).isoformat()
             docs_to_save = []
             for workout_data in workouts:
+                hevy_id = workout_data.get("hevy_id")
+                exercises = workout_data.get("exercises", [])
                 doc = {
-                    "_id": f"workout_{workout_data['hevy_id']}",
                     "type": "workout",
-                    "hevy_id": workout_data["hevy_id"],
-                    "user_id": workout_data["user_id"],
-                    "title": workout_data["title"],
+                    "hevy_id": hevy_id,
+                    "user_id": workout_data.get("user_id"),
+                    "title": workout_data.get("title", ""),
                     "description": workout_data.get("description", ""),
                     "start_time": workout_data.get("start_time"),
                     "end_time": workout_data.get("end_time"),
                     "duration_minutes": workout_data.get("duration_minutes"),
-                    "exercises": workout_data.get("exercises", []),
-                    "exercise_count": workout_data.get("exercise_count", 0),
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    "exercises": exercises,
+                    "exercise_count": workout_data.get(
+                        "exercise_count", len(exercises)
+                    ),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                 }
+                current = existing.get(hevy_id)
+                if current:
+                    doc["_id"] = current["_id"]
+                    doc["_rev"] = current["_rev"]
+                    doc["created_at"] = current.get("created_at", now_iso)
+                elif hevy_id:
+                    doc["_id"] = f"workout_{hevy_id}"
                 docs_to_save.append(doc)
 
             # Use CouchDB bulk save
-            self.db.update(docs_to_save)
-            logger.info(f"Successfully saved {len(docs_to_save)} workouts in batch")
+            results = self.db.update(docs_to_save)
+            self._invalidate_cached(*(doc_id for _, doc_id, _ in results))
+
+            saved_ids = []
+            for success, doc_id, result in results:
+                if success:
+                    saved_ids.append(doc_id)
+                else:
+                    logger.error(f"Error saving workout {doc_id}: {result}")
+            self._remember_workout_hevy_ids(
+                *(
+                    doc["hevy_id"]
+                    for doc, (success, _, _) in zip(docs_to_save, results)
+                    if success
+                )
+            )
+            logger.info(f"Successfully saved {len(saved_ids)} workouts in batch")
+            return saved_ids
 
         except Exception as e:
             logger.error(f"Error batch saving workouts: {str(e)}")
@@ -900,6 +1712,11 @@ class Database:
         """
         Save exercises to the database.
 
+        Each exercise is stored as its own exercise_<id> document, with its
+        embedding as an attachment. The collection document (base_exercises
+        or custom_exercises_<user_id>) only lists the exercise ids, so
+        changing one exercise no longer rewrites the whole catalog.
+
         Args:
             exercises: List of exercise dictionaries
             is_custom: Whether these are custom exercises
@@ -914,120 +1731,257 @@ class Database:
                 doc_id = "base_exercises"
                 doc_type = "base_exercises"
 
-            # Create document
-            exercise_doc = {
-                "_id": doc_id,
-                "type": doc_type,
-                "exercises": exercises,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            }
-
-            # Check if document already exists
-            try:
-                existing = self.db[doc_id]
-                exercise_doc["_rev"] = existing["_rev"]
-            except (couchdb.http.ResourceNotFound, AttributeError) as e:
-                # Handle both missing document and client library compatibility issues
-                logger.info(f"Document {doc_id} not found or client error: {e}")
-                pass
+            exercises = [exercise for exercise in exercises if exercise.get("id")]
+            exercise_ids = [exercise["id"] for exercise in exercises]
 
-            # Save to database
-            self.db.save(exercise_doc)
-            logger.info(
-                f"Saved {len(exercises)} {'custom' if is_custom else 'base'} exercises"
-            )
-
-            # Get existing exercises to check for embeddings
-            existing_exercises = []
-            try:
-                if is_custom and user_id:
-                    existing_doc = self.db.get(f"custom_exercises_{user_id}")
-                    if existing_doc and "exercises" in existing_doc:
-                        existing_exercises = existing_doc["exercises"]
-                        logger.info(
-                            f"Found {len(existing_exercises)} existing custom exercises"
-                        )
-                else:
-                    existing_doc = self.db.get("base_exercises")
-                    if existing_doc and "exercises" in existing_doc:
-                        existing_exercises = existing_doc["exercises"]
-                        logger.info(
-                            f"Found {len(existing_exercises)} existing base exercises"
-                        )
-            except (couchdb.http.ResourceNotFound, AttributeError) as e:
-                logger.info(
-                    f"No existing {'custom' if is_custom else 'base'} exercises found: {e}"
+            # Fetch the collection document and every per-exercise document,
+            # with their revisions and embeddings, in one request
+            existing_docs = {
+                row.key: row.doc
+                for row in self.db.view(
+                    "_all_docs",
+                    keys=[doc_id, *(f"exercise_{id}" for id in exercise_ids)],
+                    include_docs=True,
                 )
-                pass
+                if row.doc
+            }
+            existing_collection = existing_docs.pop(doc_id, None)
 
-            # Create a map of existing exercises by ID
+            # Collections written before the per-exercise layout keep the
+            # exercises (and possibly inline embeddings) in an array
+            existing_exercises = (
+                existing_collection.get("exercises", []) if existing_collection else []
+            )
             existing_exercise_map = {ex.get("id"): ex for ex in existing_exercises}
             logger.info(
-                f"Created map with {len(existing_exercise_map)} existing exercises"
+                f"Found {len(existing_docs) or len(existing_exercise_map)} existing {'custom' if is_custom else 'base'} exercises"
             )
 
-            # Only add exercises to vector store that don't already have embeddings
-            exercises_to_add = []
-            exercises_with_embeddings = 0
+            # Split exercises into those that can reuse an existing embedding
+            # and those that still need one from the vector store
+            to_reuse = []
+            to_add = []
             for exercise in exercises:
-                exercise_id = exercise.get("id")
+                exercise_id = exercise["id"]
                 exercise_title = exercise.get("title", "Unknown")
-                # logger.info(
-                #     # f"Processing exercise: {exercise_title} (ID: {exercise_id})"
-                # )
-
-                if exercise_id in existing_exercise_map:
-                    # Check if the existing exercise has an embedding
-                    if "embedding" in existing_exercise_map[exercise_id]:
-                        # Copy the embedding to the new exercise
-                        exercise["embedding"] = existing_exercise_map[exercise_id][
-                            "embedding"
-                        ]
-                        # logger.info(
-                        #     # f"Reused existing embedding for exercise: {exercise_title}"
-                        # )
-                        # Save the exercise with the embedding
-                        self.save_exercise(exercise)
-                        exercises_with_embeddings += 1
-                    else:
-                        logger.info(
-                            f"No embedding found for existing exercise: {exercise_title}"
-                        )
-                        exercises_to_add.append(exercise)
+                existing = existing_exercise_map.get(exercise_id)
+                existing_doc = existing_docs.get(f"exercise_{exercise_id}")
+
+                if exercise.get("embedding") is not None or (
+                    existing_doc and _has_embedding(existing_doc)
+                ):
+                    to_reuse.append(exercise)
+                elif existing and existing.get("embedding") is not None:
+                    exercise["embedding"] = existing["embedding"]
+                    to_reuse.append(exercise)
+                elif existing or existing_doc:
+                    logger.info(
+                        f"No embedding found for existing exercise: {exercise_title}"
+                    )
+                    to_add.append(exercise)
                 else:
-                    # New exercise, add to vector store
                     logger.info(f"New exercise found: {exercise_title}")
-                    exercises_to_add.append(exercise)
+                    to_add.append(exercise)
 
-            logger.info(
-                f"Found {exercises_with_embeddings} exercises with existing embeddings"
-            )
-            logger.info(
-                f"Need to generate embeddings for {len(exercises_to_add)} exercises"
-            )
+            logger.info(f"Found {len(to_reuse)} exercises with existing embeddings")
+            logger.info(f"Need to generate embeddings for {len(to_add)} exercises")
 
             # Only add new exercises to vector store
-            if exercises_to_add:
+            if to_add:
                 from services.vector_store import ExerciseVectorStore
 
                 vector_store = ExerciseVectorStore()
-                vector_store.add_exercises(exercises_to_add)
+                vector_store.add_exercises(to_add)
 
-                # Update the exercises in the database with the embeddings
-                for exercise in exercises_to_add:
-                    if "embedding" in exercise:
-                        # Save the exercise with the embedding
-                        self.save_exercise(exercise)
-                        logger.info(
-                            f"Saved exercise with new embedding: {exercise.get('name', 'Unknown')}"
-                        )
+            docs = self._build_exercise_docs(
+                exercises, existing_docs, user_id if is_custom else None
+            )
+
+            # The collection document becomes an index of exercise ids
+            collection_doc = {
+                "_id": doc_id,
+                "type": doc_type,
+                "exercise_ids": exercise_ids,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if existing_collection:
+                collection_doc["_rev"] = existing_collection["_rev"]
+            docs.append(collection_doc)
+
+            # Write the changed exercises and the index in one bulk request
+            self._bulk_update(docs)
+            logger.info(
+                f"Saved {len(exercises)} {'custom' if is_custom else 'base'} exercises"
+            )
 
         except Exception as e:
             logger.error(f"Error saving exercises: {str(e)}")
             raise
 
+    def _build_exercise_docs(
+        self,
+        exercises: List[Dict[str, Any]],
+        existing_docs: Dict[str, Dict[str, Any]],
+        user_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the exercise_<id> documents that need writing.
+
+        Exercises without a new embedding keep the attachment of their existing
+        document, and documents whose content is unchanged are left out.
+
+        Args:
+            exercises: Exercise dictionaries, each with an id
+            existing_docs: Current exercise_<id> documents keyed by _id
+            user_id: Owner of custom exercises
+
+        Returns:
+            Documents to pass to a bulk update
+        """
+        docs = []
+        for exercise in exercises:
+            doc_id = f"exercise_{exercise['id']}"
+            existing = existing_docs.get(doc_id)
+            embedding = exercise.get("embedding")
+
+            doc = {k: v for k, v in exercise.items() if k != "embedding"}
+            doc["_id"] = doc_id
+            doc["type"] = "exercise"
+            doc.setdefault("hevy_id", exercise["id"])
+            if user_id:
+                doc["user_id"] = user_id
+
+            if existing and embedding is None:
+                if existing.get("embedding") is not None:
+                    # Legacy inline embedding: move it into the attachment
+                    embedding = existing["embedding"]
+                elif "_attachments" in existing:
+                    doc["_attachments"] = existing["_attachments"]
+            if embedding is not None:
+                doc["_attachments"] = {
+                    EMBEDDING_ATTACHMENT: _embedding_attachment(embedding)
+                }
+
+            if existing:
+                doc["_rev"] = existing["_rev"]
+                if doc == existing:
+                    continue
+            docs.append(doc)
+        return docs
+
+    def _bulk_update(self, docs: List[Dict[str, Any]]) -> None:
+        """
+        Write documents with a single _bulk_docs request.
+
+        Documents that conflict with a concurrent write are retried once with
+        fresh revisions; other per-document failures are logged.
+
+        Args:
+            docs: Documents to write, with _rev set for existing ones
+        """
+        if not docs:
+            return
+
+        for _ in range(2):
+            results = self.db.update(docs)
+            self._invalidate_cached(*(doc["_id"] for doc in docs))
+
+            conflicted = {
+                doc_id
+                for success, doc_id, result in results
+                if not success and isinstance(result, couchdb.http.ResourceConflict)
+            }
+            for success, doc_id, result in results:
+                if not success and doc_id not in conflicted:
+                    logger.error(f"Error saving document {doc_id}: {result}")
+
+            saved = sum(1 for success, _, _ in results if success)
+            logger.info(f"Saved {saved} documents in bulk")
+
+            if not conflicted:
+                return
+            docs = [doc for doc in docs if doc["_id"] in conflicted]
+            logger.warning(f"Retrying {len(docs)} documents after update conflicts")
+
+            # Refresh revisions for the conflicted documents in one request
+            docs_by_id = {doc["_id"]: doc for doc in docs}
+            for row in self.db.view("_all_docs", keys=list(docs_by_id)):
+                if row.value and not row.value.get("deleted"):
+                    docs_by_id[row.key]["_rev"] = row.value["rev"]
+
+        logger.error(
+            f"Could not save {len(docs)} documents: {[doc['_id'] for doc in docs]}"
+        )
+
+    def _get_exercise_collection(
+        self, doc_id: str, fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the exercises listed by a collection document.
+
+        Args:
+            doc_id: base_exercises or custom_exercises_<user_id>
+            fields: Optional set of exercise fields to return; others are
+                never fetched
+
+        Returns:
+            Exercise dictionaries without CouchDB metadata or embeddings
+        """
+        cache_key = doc_id if fields is None else (doc_id, tuple(sorted(fields)))
+        with Database._doc_cache_lock:
+            cached = Database._exercise_cache.get(cache_key)
+        if cached is None:
+            cached = self._load_exercise_collection(doc_id, fields)
+            with Database._doc_cache_lock:
+                Database._exercise_cache[cache_key] = cached
+
+        # Fresh dicts so callers can annotate exercises without touching the cache
+        return [dict(exercise) for exercise in cached]
+
+    def _load_exercise_collection(
+        self, doc_id: str, fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        collection = self.get_document(doc_id)
+        if not collection:
+            return []
+
+        # Collections written before the per-exercise layout
+        if "exercise_ids" not in collection:
+            exercises = collection.get("exercises", [])
+            if fields is None:
+                return exercises
+            return [
+                {k: v for k, v in exercise.items() if k in fields}
+                for exercise in exercises
+            ]
+
+        keys = [f"exercise_{id}" for id in collection["exercise_ids"]]
+        if not keys:
+            return []
+        if fields is None:
+            return [
+                _exercise_from_doc(row.doc)
+                for row in self.db.view("_all_docs", keys=keys, include_docs=True)
+                if row.doc
+            ]
+
+        # Let CouchDB project the documents so unused fields stay on the server
+        _, _, result = self.db.resource.post_json(
+            "_find",
+            body={
+                "selector": {"_id": {"$in": keys}},
+                "fields": ["_id", *sorted(fields)],
+                "limit": len(keys),
+            },
+        )
+        by_id = {doc.pop("_id"): doc for doc in result.get("docs", [])}
+        return [by_id[key] for key in keys if key in by_id]
+
     def get_exercises(
-        self, user_id: Optional[str] = None, include_custom: bool = True
+        self,
+        user_id: Optional[str] = None,
+        include_custom: bool = True,
+        fields: Optional[Set[str]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Get all available exercises from the database.
@@ -1035,64 +1989,78 @@ class Database:
         Args:
             user_id: Optional user ID to get custom exercises for
             include_custom: Whether to include custom exercises in the results
+            fields: Optional set of exercise fields to return, for callers
+                that only need e.g. ids and titles
 
         Returns:
             List of exercise dictionaries
         """
         try:
-            exercises = []
-
-            # Get base exercises
-            try:
-                base_doc = self.db.get("base_exercises")
-                if base_doc:
-                    logger.info(f"Found base exercises document: {base_doc.get('_id')}")
-                    if "exercises" in base_doc:
-                        logger.info(
-                            f"Found {len(base_doc['exercises'])} base exercises"
-                        )
-                        exercises.extend(base_doc["exercises"])
-                    else:
-                        logger.warning(
-                            "Base exercises document exists but has no exercises field"
-                        )
-                else:
-                    logger.warning("Base exercises document not found")
-            except couchdb.http.ResourceNotFound:
-                logger.info("No base exercises found in database")
+            exercises = self._get_exercise_collection("base_exercises", fields)
+            if exercises:
+                logger.info(f"Found {len(exercises)} base exercises")
+            else:
+                logger.warning("Base exercises document not found or empty")
 
             # Get custom exercises if requested
             if include_custom and user_id:
-                try:
-                    custom_doc = self.db.get(f"custom_exercises_{user_id}")
-                    if custom_doc and "exercises" in custom_doc:
-                        exercises.extend(custom_doc["exercises"])
-                except couchdb.http.ResourceNotFound:
-                    logger.info(f"No custom exercises found for user {user_id}")
+                exercises.extend(self.get_custom_exercises(user_id, fields))
 
             return exercises
         except Exception as e:
             logger.error(f"Error getting exercises: {str(e)}")
             return []
 
-    def get_custom_exercises(self, user_id: str) -> List[Dict[str, Any]]:
+    def count_exercises(
+        self, user_id: Optional[str] = None, include_custom: bool = True
+    ) -> int:
+        """
+        Count the available exercises without loading them.
+
+        Only the collection documents are read; their exercise id lists give
+        the count.
+
+        Args:
+            user_id: Optional user ID to count custom exercises for
+            include_custom: Whether to include custom exercises in the count
+
+        Returns:
+            Number of exercises
+        """
+        try:
+            doc_ids = ["base_exercises"]
+            if include_custom and user_id:
+                doc_ids.append(f"custom_exercises_{user_id}")
+            count = 0
+            for doc_id in doc_ids:
+                collection = self.get_document(doc_id)
+                if not collection:
+                    continue
+                if "exercise_ids" in collection:
+                    count += len(collection["exercise_ids"])
+                else:
+                    # Collections written before the per-exercise layout
+                    count += len(collection.get("exercises", []))
+            return count
+        except Exception as e:
+            logger.error(f"Error counting exercises: {str(e)}")
+            return 0
+
+    def get_custom_exercises(
+        self, user_id: str, fields: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get custom exercises for a specific user.
 
         Args:
             user_id: User ID to get custom exercises for
+            fields: Optional set of exercise fields to return
 
         Returns:
             List of custom exercise dictionaries
         """
         try:
-            custom_doc = self.db.get(f"custom_exercises_{user_id}")
-            if custom_doc and "exercises" in custom_doc:
-                return custom_doc["exercises"]
-            return []
-        except couchdb.http.ResourceNotFound:
-            logger.info(f"No custom exercises found for user {user_id}")
-            return []
+            return self._get_exercise_collection(f"custom_exercises_{user_id}", fields)
         except Exception as e:
             logger.error(f"Error getting custom exercises: {str(e)}")
             return []
@@ -1102,6 +2070,9 @@ class Database:
         """
         Save multiple workouts for a user.
 
+        The workouts are written with one _bulk_docs request through
+        save_workouts_batch. Failures are logged and left out of the result.
+
         Args:
             user_id: The user's ID to associate with each workout.
             workouts: List of workout dicts to save.
@@ -1109,8 +2080,10 @@ class Database:
         Returns:
             List of document IDs for the saved workouts.
         """
-        doc_ids = []
         for workout in workouts:
-            doc_id = self.save_workout(workout_data=workout, user_id=user_id)
-            doc_ids.append(doc_id)
-        return doc_ids
+            workout["user_id"] = user_id
+        try:
+            return self.save_workouts_batch(workouts)
+        except Exception as e:
+            logger.error(f"Error saving workouts for user {user_id}: {str(e)}")
+            return []
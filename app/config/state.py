@@ -33,6 +33,54 @@ def safe_state_operation(func):
     return wrapper
 
 
+# Pages with a content block and a nav button, in the order the handlers expect
+PAGES = ("register", "login", "landing", "dashboard", "ai_recs", "profile")
+
+
+def _page_updates(page):
+    """Build the block visibility and nav button variant updates for a page."""
+    return (
+        *(gr.update(visible=page == name) for name in PAGES),
+        page,
+        # Update button variants to show active state
+        *(
+            gr.update(variant="primary" if page == name else "secondary")
+            for name in PAGES
+        ),
+    )
+
+
+# The updates only depend on the page or the login state, so build them once.
+# Gradio does not copy update dicts: it pops "value" from them as it applies
+# them. Sharing is only safe because these hold visible/variant updates and
+# nothing else - never a value and never a None entry; any update that needs
+# one must be built fresh per call
+_PAGE_UPDATES = {page: _page_updates(page) for page in PAGES}
+
+_NAV_UPDATES = {
+    # Not logged in - show only register and login
+    False: (
+        gr.update(visible=True),  # register
+        gr.update(visible=True),  # login
+        gr.update(visible=True),  # landing
+        gr.update(visible=False),  # dashboard
+        gr.update(visible=False),  # ai_recs
+        gr.update(visible=False),  # profile
+        gr.update(visible=False),  # logout
+    ),
+    # Logged in - show all except register and login
+    True: (
+        gr.update(visible=False),  # register
+        gr.update(visible=False),  # login
+        gr.update(visible=True),  # landing
+        gr.update(visible=True),  # dashboard
+        gr.update(visible=True),  # ai_recs
+        gr.update(visible=True),  # profile
+        gr.update(visible=True),  # logout
+    ),
+}
+
+
 def setup_state(app):
     """Setup application state management."""
     with app:
@@ -43,48 +91,13 @@ def setup_state(app):
         @safe_state_operation
         def update_visibility(page):
             """Update visibility of blocks and navigation button states."""
-            return (
-                gr.update(visible=page == "register"),
-                gr.update(visible=page == "login"),
-                gr.update(visible=page == "landing"),
-                gr.update(visible=page == "dashboard"),
-                gr.update(visible=page == "ai_recs"),
-                gr.update(visible=page == "profile"),
-                page,
-                # Update button variants to show active state
-                gr.update(variant="primary" if page == "register" else "secondary"),
-                gr.update(variant="primary" if page == "login" else "secondary"),
-                gr.update(variant="primary" if page == "landing" else "secondary"),
-                gr.update(variant="primary" if page == "dashboard" else "secondary"),
-                gr.update(variant="primary" if page == "ai_recs" else "secondary"),
-                gr.update(variant="primary" if page == "profile" else "secondary"),
-            )
+            updates = _PAGE_UPDATES.get(page)
+            return updates if updates is not None else _page_updates(page)
 
         @safe_state_operation
         def update_nav_visibility(user):
             """Update navigation visibility based on user state."""
-            if user is None:
-                # Not logged in - show only register and login
-                return (
-                    gr.update(visible=True),  # register
-                    gr.update(visible=True),  # login
-                    gr.update(visible=True),  # landing
-                    gr.update(visible=False),  # dashboard
-                    gr.update(visible=False),  # ai_recs
-                    gr.update(visible=False),  # profile
-                    gr.update(visible=False),  # logout
-                )
-            else:
-                # Logged in - show all except register and login
-                return (
-                    gr.update(visible=False),  # register
-                    gr.update(visible=False),  # login
-                    gr.update(visible=True),  # landing
-                    gr.update(visible=True),  # dashboard
-                    gr.update(visible=True),  # ai_recs
-                    gr.update(visible=True),  # profile
-                    gr.update(visible=True),  # logout
-                )
+            return _NAV_UPDATES[user is not None]
 
     return {
         "current_page": current_page,
@@ -1,5 +1,5 @@
-def create_workout_views(db):
-    """Create all necessary views for workout queries."""
+def build_workout_views():
+    """Build the workouts design document."""
 
     # View for finding workouts by date range
     date_range_view = {
@@ -12,7 +12,7 @@ def create_workout_views(db):
                     description: doc.description,
                     start_time: doc.start_time,
                     end_time: doc.end_time,
-                    exercise_count: doc.exercise_count || (doc.exercises ? doc.exercises.length : 0)
+                    exercise_count: doc.exercise_count
                 });
             }
         }
@@ -38,16 +38,15 @@ def create_workout_views(db):
         """,
     }
 
-    # View for workout statistics (latest version)
+    # View for workout statistics (latest version). Values only carry the
+    # numbers the reduce sums; the latest workout date comes from the key.
     stats_view = {
         "map": """
         function(doc) {
             if (doc.type === 'workout' && doc.user_id && doc.start_time && doc.exercises) {
                 var totalSets = 0;
-                var totalExercises = doc.exercises.length;
                 var totalWeight = 0;
                 var totalReps = 0;
-                var lastWorkoutDate = doc.start_time;
                 doc.exercises.forEach(function(exercise) {
                     exercise.sets.forEach(function(set) {
                         totalSets++;
@@ -55,46 +54,24 @@ def create_workout_views(db):
                         if (set.reps) totalReps += set.reps;
                     });
                 });
-                emit([doc.user_id, doc.start_time], {
-                    workout_id: doc._id,
-                    title: doc.title,
-                    total_exercises: totalExercises,
-                    total_sets: totalSets,
-                    total_weight: totalWeight,
-                    total_reps: totalReps,
-                    duration: (new Date(doc.end_time) - new Date(doc.start_time)) / 1000 / 60,
-                    count: 1,
-                    last_workout_date: lastWorkoutDate
-                });
+                // Fixed-order array so the builtin _sum reducer can add it up:
+                // [workouts, exercises, sets, weight, reps, duration]
+                emit([doc.user_id, doc.start_time], [
+                    1,
+                    doc.exercises.length,
+                    totalSets,
+                    totalWeight,
+                    totalReps,
+                    typeof doc.duration_minutes === 'number'
+                        ? doc.duration_minutes
+                        : (new Date(doc.end_time) - new Date(doc.start_time)) / 1000 / 60 || 0
+                ]);
             }
         }
         """,
-        "reduce": """
-       function(keys, values, rereduce) {
-            var result = {
-                total_workouts: 0,
-                total_exercises: 0,
-                total_sets: 0,
-                total_weight: 0,
-                total_reps: 0,
-                total_duration: 0,
-                last_workout_date: null
-            };
-            values.forEach(function(value) {
-                result.total_workouts += value.count || value.total_workouts || 1;
-                result.total_exercises += value.total_exercises || 0;
-                result.total_sets += value.total_sets || 0;
-                result.total_weight += value.total_weight || 0;
-                result.total_reps += value.total_reps || 0;
-                result.total_duration += value.duration || value.total_duration || 0;
-                var date = value.last_workout_date;
-                if (!result.last_workout_date || (date && date > result.last_workout_date)) {
-                    result.last_workout_date = date;
-                }
-            });
-            return result;
-        }
-        """,
+        # Summed natively by CouchDB; the last workout date is read from the
+        # view's keys by the query layer instead
+        "reduce": "_sum",
     }
 
     # View for finding workouts by Hevy ID
@@ -108,15 +85,29 @@ def create_workout_views(db):
         """,
     }
 
-    # View for finding workouts by user ID
+    # View for finding workouts by user ID. Rows carry no value; query with
+    # include_docs=true when the documents are needed.
     user_view = {
         "map": """
         function(doc) {
             if (doc.type === 'workout' && doc.user_id && doc.start_time) {
-                emit([doc.user_id, doc.start_time], doc);
+                emit([doc.user_id, doc.start_time], null);
+            }
+        }
+        """,
+    }
+
+    # View counting a user's workouts per day. Query with group_level=2 to get
+    # one [user_id, YYYY-MM-DD] row per day the user worked out.
+    user_day_view = {
+        "map": """
+        function(doc) {
+            if (doc.type === 'workout' && doc.user_id && doc.start_time) {
+                emit([doc.user_id, doc.start_time.substring(0, 10)], null);
             }
         }
         """,
+        "reduce": "_count",
     }
 
     # Create the design document with all views
@@ -128,19 +119,94 @@ def create_workout_views(db):
             "stats": stats_view,
             "by_hevy_id": hevy_id_view,
             "by_user": user_view,
+            "by_user_day": user_day_view,
         },
     }
 
+    return design_doc
+
+
+def create_workout_views(db):
+    """Save the design document from build_workout_views."""
     try:
-        db.save(design_doc)
+        db.save(build_workout_views())
         return True
     except Exception as e:
         print(f"Error creating workout views: {e}")
         return False
 
 
-def create_user_views(db):
-    """Create all necessary views for user profile queries."""
+def build_native_workout_views():
+    """Build Erlang versions of the hot workout views.
+
+    These live in their own design document because a design document has a
+    single language. They only work when the server enables the native query
+    server ([native_query_servers] enable_erlang_query_server = true).
+    """
+
+    # Same rows as workouts/by_date
+    date_range_view = {
+        "map": """
+        fun({Doc}) ->
+            case {couch_util:get_value(<<"type">>, Doc),
+                  couch_util:get_value(<<"start_time">>, Doc)} of
+                {<<"workout">>, StartTime} when is_binary(StartTime) ->
+                    Emit(StartTime, {[
+                        {<<"id">>, couch_util:get_value(<<"_id">>, Doc)},
+                        {<<"title">>, couch_util:get_value(<<"title">>, Doc, null)},
+                        {<<"description">>, couch_util:get_value(<<"description">>, Doc, null)},
+                        {<<"start_time">>, StartTime},
+                        {<<"end_time">>, couch_util:get_value(<<"end_time">>, Doc, null)},
+                        {<<"exercise_count">>, couch_util:get_value(<<"exercise_count">>, Doc, null)}
+                    ]});
+                _ ->
+                    ok
+            end
+        end.
+        """,
+    }
+
+    # Same rows as workouts/by_user
+    user_view = {
+        "map": """
+        fun({Doc}) ->
+            case {couch_util:get_value(<<"type">>, Doc),
+                  couch_util:get_value(<<"user_id">>, Doc),
+                  couch_util:get_value(<<"start_time">>, Doc)} of
+                {<<"workout">>, UserId, StartTime}
+                        when is_binary(UserId), is_binary(StartTime) ->
+                    Emit([UserId, StartTime], null);
+                _ ->
+                    ok
+            end
+        end.
+        """,
+    }
+
+    design_doc = {
+        "_id": "_design/workouts_native",
+        "language": "erlang",
+        "views": {
+            "by_date": date_range_view,
+            "by_user": user_view,
+        },
+    }
+
+    return design_doc
+
+
+def create_native_workout_views(db):
+    """Save the design document from build_native_workout_views."""
+    try:
+        db.save(build_native_workout_views())
+        return True
+    except Exception as e:
+        print(f"Error creating native workout views: {e}")
+        return False
+
+
+def build_user_views():
+    """Build the users design document."""
 
     # View for finding users by username
     username_view = {
@@ -211,16 +277,21 @@ def create_user_views(db):
         },
     }
 
+    return design_doc
+
+
+def create_user_views(db):
+    """Save the design document from build_user_views."""
     try:
-        db.save(design_doc)
+        db.save(build_user_views())
         return True
     except Exception as e:
         print(f"Error creating user views: {e}")
         return False
 
 
-def create_exercise_views(db):
-    """Create all necessary views for exercise queries."""
+def build_exercise_views():
+    """Build the exercises design document."""
     by_hevy_id_view = {
         "map": """
         function(doc) {
@@ -258,8 +329,13 @@ def create_exercise_views(db):
             "all": all_view,
         },
     }
+    return design_doc
+
+
+def create_exercise_views(db):
+    """Save the design document from build_exercise_views."""
     try:
-        db.save(design_doc)
+        db.save(build_exercise_views())
         return True
     except Exception as e:
         print(f"Error creating exercise views: {e}")
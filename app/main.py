@@ -3,61 +3,60 @@ Main application entry point for the AI Personal Trainer.
 """
 
 # Configure logging
+import atexit
 import logging
+import logging.handlers
 import os
-from datetime import datetime, timedelta, timezone
+import queue
+import threading
 
 import gradio as gr
 from dotenv import load_dotenv
 
 from app.config.database import Database
 from app.config.state import setup_state
-from app.models.user import FitnessGoal, Injury, InjurySeverity, Sex, UserProfile
-from app.pages.ai_recs import ai_recs_view
-from app.pages.dashboard import dashboard_view
-from app.pages.login import login_view
-from app.pages.profile import profile_view
-from app.pages.register import register_view
+from app.pages.ai_recs import warm_up as warm_up_ai_recs
 from app.routes import setup_routes
-from app.services.hevy_api import HevyAPI
-from app.services.openai_service import OpenAIService
-from app.theme import setup_theme
-from app.utils.crypto import decrypt_api_key, encrypt_api_key
-from app.utils.units import (
-    cm_to_inches,
-    format_height_cm,
-    format_weight_kg,
-    inches_to_cm,
-    kg_to_lbs,
-    lbs_to_kg,
-)
+from app.state.vectorstore_status import VECTORSTORE_READY
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter("%(levelname)s:%(name)s:%(message)s")
-console_handler.setFormatter(console_formatter)
 
-# File handler
-file_handler = logging.FileHandler("app.log", mode="a")
-file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter("%(asctime)s %(levelname)s:%(name)s:%(message)s")
-file_handler.setFormatter(file_formatter)
+def add_file_logging(file_handler):
+    """Attach a queued file handler and start its writer thread.
 
-# Add handlers (avoid duplicates)
-if not logger.hasHandlers():
+    Request threads only enqueue file records; a listener thread writes them
+    so handlers never block on disk I/O. The console stays synchronous so a
+    crash still shows the last lines.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(logging.INFO)
+    queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    logger.addHandler(queue_handler)
+    queue_listener.start()
+    # Drain queued records into app.log on shutdown
+    atexit.register(queue_listener.stop)
+
+
+# Set up handlers once per process; reloads re-run this module
+if gr.NO_RELOAD:
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_formatter = logging.Formatter("%(levelname)s:%(name)s:%(message)s")
+    console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-else:
-    # Prevent adding multiple handlers if this code runs more than once
-    handler_types = [type(h) for h in logger.handlers]
-    if logging.StreamHandler not in handler_types:
-        logger.addHandler(console_handler)
-    if logging.FileHandler not in handler_types:
-        logger.addHandler(file_handler)
+
+    # File handler
+    file_handler = logging.FileHandler("app.log", mode="a")
+    file_handler.setLevel(logging.INFO)
+    file_formatter = logging.Formatter("%(asctime)s %(levelname)s:%(name)s:%(message)s")
+    file_handler.setFormatter(file_formatter)
+    add_file_logging(file_handler)
 
 favicon_path = os.path.abspath("app/static/images/favicon.ico")
 
@@ -66,32 +65,51 @@ load_dotenv()
 
 port = int(os.getenv("PORT", 7860))
 
+
+def run_vectorstore_bootstrap():
+    """Populate the vector store, then mark it ready for AI features."""
+    logger.info("Bootstrapping vectorstore for production environment")
+    try:
+        from app.scripts.bootstrap_vectorstore import bootstrap_vectorstore
+
+        bootstrap_success = bootstrap_vectorstore()
+        if bootstrap_success:
+            logger.info("Vector store bootstrapped successfully!")
+        else:
+            logger.warning(
+                "Vector store bootstrap failed - exercises may not be populated yet"
+            )
+            logger.warning(
+                "Run 'python app/scripts/populate_exercises.py' to populate exercises"
+            )
+    except Exception as e:
+        logger.error(f"Vector store bootstrap failed: {e}")
+        logger.warning(
+            "App will continue without vector store - AI features may not work"
+        )
+    finally:
+        VECTORSTORE_READY.set()
+
+
 # Initialize database connection - only do this once
 if gr.NO_RELOAD:
-    db = Database()
+    db = Database.instance()
     logger.info("Database initialized successfully")
 
-    # Bootstrap vectorstore if in production
+    # Build view indexes in the background before the first request needs them
+    db.warm_views()
+
+    # Bootstrap vectorstore if in production, in the background so the
+    # server starts accepting requests right away
     if os.getenv("ENV") == "production":
-        logger.info("Bootstrapping vectorstore for production environment")
-        try:
-            from app.scripts.bootstrap_vectorstore import bootstrap_vectorstore
-
-            bootstrap_success = bootstrap_vectorstore()
-            if bootstrap_success:
-                logger.info("Vector store bootstrapped successfully!")
-            else:
-                logger.warning(
-                    "Vector store bootstrap failed - exercises may not be populated yet"
-                )
-                logger.warning(
-                    "Run 'python app/scripts/populate_exercises.py' to populate exercises"
-                )
-        except Exception as e:
-            logger.error(f"Vector store bootstrap failed: {e}")
-            logger.warning(
-                "App will continue without vector store - AI features may not work"
-            )
+        VECTORSTORE_READY.clear()
+        threading.Thread(
+            target=run_vectorstore_bootstrap, name="vs-bootstrap", daemon=True
+        ).start()
+
+    # Open the OpenAI connection and load the vector store ahead of the
+    # first routine generation
+    threading.Thread(target=warm_up_ai_recs, name="ai-warmup", daemon=True).start()
 
 
 def create_app():
@@ -1,11 +1,21 @@
+import functools
 import os
+import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 import bcrypt
-from pydantic import BaseModel, EmailStr, Field, SecretStr
-
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    Field,
+    SecretStr,
+    ValidationInfo,
+    field_validator,
+)
+
+from app.config.config import BCRYPT_ROUNDS
 from app.utils.crypto import encrypt_api_key
 
 
@@ -51,9 +61,7 @@ class FitnessGoal(str, Enum):
 
 
 class UserProfile(BaseModel):
-    id: str = Field(
-        default_factory=lambda: f"user_{datetime.now(timezone.utc).timestamp()}"
-    )
+    id: str = Field(default_factory=lambda: f"user_{time.time_ns()}")
     type: str = "user_profile"  # Add this field to identify user documents
     username: str
     email: EmailStr
@@ -69,7 +77,7 @@ class UserProfile(BaseModel):
     height_cm: float
     weight_kg: float
     sex: Sex
-    age: int
+    age: Annotated[int, Field(ge=13, le=120)]
 
     # Weight History
     weight_history: list = Field(
@@ -81,8 +89,9 @@ class UserProfile(BaseModel):
     injuries: List[Injury] = Field(default_factory=list)
 
     # Workout Preferences
-    preferred_workout_days: int = 3  # Number of days per week
-    preferred_workout_duration: int = 60  # Duration in minutes
+    # Days per week and duration in minutes
+    preferred_workout_days: Annotated[int, Field(ge=1, le=7)] = 3
+    preferred_workout_duration: Annotated[int, Field(ge=15, le=240)] = 60
 
     # Unit Preferences
     preferred_units: UnitSystem = (
@@ -100,30 +109,14 @@ class UserProfile(BaseModel):
     _rev: Optional[str] = None
 
     def model_dump(self, *args, **kwargs):
-        """Override model_dump method to ensure datetime serialization."""
-        d = super().model_dump(*args, **kwargs)
-        # Convert any remaining datetime objects to ISO format strings
-        for key, value in d.items():
-            if isinstance(value, datetime):
-                d[key] = value.isoformat()
-            elif isinstance(value, list):
-                for i, item in enumerate(value):
-                    if isinstance(item, datetime):
-                        d[key][i] = item.isoformat()
-                    elif isinstance(item, dict):
-                        for k, v in item.items():
-                            if isinstance(v, datetime):
-                                d[key][i][k] = v.isoformat()
-        # Serialize weight_history datetimes
-        if "weight_history" in d and isinstance(d["weight_history"], list):
-            for entry in d["weight_history"]:
-                if (
-                    isinstance(entry, dict)
-                    and "date" in entry
-                    and isinstance(entry["date"], datetime)
-                ):
-                    entry["date"] = entry["date"].isoformat()
-        return d
+        """Override model_dump method to ensure datetime serialization.
+
+        Defaults to Pydantic's JSON mode, which turns every datetime
+        (including those inside weight_history and injuries) into an ISO
+        8601 string and enums into their values.
+        """
+        kwargs.setdefault("mode", "json")
+        return super().model_dump(*args, **kwargs)
 
     @classmethod
     def create_user(
@@ -143,10 +136,16 @@ class UserProfile(BaseModel):
         hevy_api_key: Optional[str] = None,
         injuries: Optional[List[dict]] = None,
         weight_history: Optional[list] = None,
+        rounds: int = BCRYPT_ROUNDS,
     ) -> "UserProfile":
-        """Create a new user with a hashed password."""
+        """Create a new user with a hashed password.
+
+        bcrypt releases the GIL while hashing, so registrations handled on
+        Gradio's worker threads hash in parallel. rounds sets the cost
+        factor (BCRYPT_ROUNDS, default 12).
+        """
         # Generate a salt and hash the password
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds)
         password_hash = bcrypt.hashpw(password.encode("utf-8"), salt)
 
         if weight_history is None:
@@ -182,77 +181,111 @@ class UserProfile(BaseModel):
             password.encode("utf-8"), self.password_hash.encode("utf-8")
         )
 
+    @functools.cached_property
+    def goal_values(self) -> tuple:
+        """Fitness goal values, computed once per profile instance."""
+        return tuple(g.value for g in self.fitness_goals)
+
+    @functools.cached_property
+    def injury_dicts(self) -> list:
+        """Injuries in the shape the routine generator expects."""
+        return [
+            {
+                "description": i.description,
+                "body_part": i.body_part,
+                "is_active": i.is_active,
+            }
+            for i in self.injuries
+        ]
+
+    @functools.cached_property
+    def goals_markdown(self) -> str:
+        """Fitness goals as a markdown list."""
+        return "\n".join(f"- {goal}" for goal in self.goal_values)
+
+    @functools.cached_property
+    def injuries_markdown(self) -> str:
+        """Active injuries as a markdown list."""
+        injuries_text = "\n".join(
+            f"- {i.description} ({i.body_part}) - {i.severity.value} severity"
+            for i in self.injuries
+            if i.is_active
+        )
+        return injuries_text or "No active injuries"
+
     def to_dict(self) -> dict:
         """Convert to dictionary with proper datetime serialization."""
         return self.model_dump()
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize straight to a JSON document body for Database.save_raw."""
+        return self.model_dump_json().encode("utf-8")
+
+    @field_validator("email", mode="wrap")
     @classmethod
-    def from_dict(cls, data: dict) -> "UserProfile":
-        """Create a UserProfile instance from a dictionary."""
-        # Parse weight_history
-        wh = data.get("weight_history", [])
-        parsed_wh = []
-        for entry in wh:
+    def _trust_stored_email(cls, value, handler, info: ValidationInfo):
+        """Skip email validation for documents already validated on register."""
+        if info.context and info.context.get("from_db") and isinstance(value, str):
+            return value
+        return handler(value)
+
+    @field_validator(
+        "age", "preferred_workout_days", "preferred_workout_duration", mode="before"
+    )
+    @classmethod
+    def _clamp_stored_ranges(cls, value, info: ValidationInfo):
+        """Clamp stored values saved before these fields were bounded.
+
+        Only documents loaded with from_dict are clamped, so legacy profiles
+        still load; new input is validated against the bounds as usual.
+        """
+        if not (info.context and info.context.get("from_db")):
+            return value
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            return value
+        for constraint in cls.model_fields[info.field_name].metadata:
+            if getattr(constraint, "ge", None) is not None:
+                number = max(number, constraint.ge)
+            if getattr(constraint, "le", None) is not None:
+                number = min(number, constraint.le)
+        return number
+
+    @field_validator("weight_history", mode="before")
+    @classmethod
+    def _parse_weight_history(cls, value):
+        """Parse ISO dates in weight entries and wrap legacy bare weights."""
+        if not isinstance(value, list):
+            return value
+        parsed = []
+        for entry in value:
             if isinstance(entry, dict):
-                weight = entry.get("weight")
                 date = entry.get("date")
                 if isinstance(date, str):
                     try:
                         date = datetime.fromisoformat(date)
-                    except Exception:
+                    except ValueError:
                         date = None
-                parsed_wh.append({"weight": weight, "date": date})
+                parsed.append({**entry, "date": date})
             elif isinstance(entry, (float, int)):
                 # Just a number, treat as weight with unknown date
-                parsed_wh.append({"weight": entry, "date": None})
-            elif isinstance(entry, dict) and "weight" in entry and "date" in entry:
-                parsed_wh.append(entry)
-            else:
-                parsed_wh.append(entry)
-
-        # Parse injuries robustly
-        injuries_raw = data.get("injuries", [])
-        parsed_injuries = []
-        for injury in injuries_raw:
-            if isinstance(injury, Injury):
-                parsed_injuries.append(injury)
-            elif isinstance(injury, dict):
-                parsed_injuries.append(Injury(**injury))
-            else:
-                parsed_injuries.append(injury)
-
-        # Parse fitness_goals robustly
-        fg_raw = data.get("fitness_goals", [])
-        parsed_fg = []
-        for g in fg_raw:
-            if isinstance(g, FitnessGoal):
-                parsed_fg.append(g)
-            elif isinstance(g, str):
-                parsed_fg.append(FitnessGoal(g))
+                parsed.append({"weight": entry, "date": None})
             else:
-                parsed_fg.append(g)
+                parsed.append(entry)
+        return parsed
 
-        return cls(
-            id=data.get("_id", data.get("id")),
-            username=data["username"],
-            email=data["email"],
-            password_hash=data["password_hash"],
-            height_cm=data["height_cm"],
-            weight_kg=data["weight_kg"],
-            sex=Sex(data["sex"]),
-            age=data["age"],
-            fitness_goals=parsed_fg,
-            experience_level=data["experience_level"],
-            preferred_workout_days=data.get("preferred_workout_days", 3),
-            preferred_workout_duration=data.get("preferred_workout_duration", 60),
-            preferred_units=UnitSystem(
-                data.get("preferred_units", UnitSystem.IMPERIAL)
-            ),
-            hevy_api_key=data.get("hevy_api_key"),
-            injuries=parsed_injuries,
-            weight_history=parsed_wh,
-            _rev=data.get("_rev"),
-        )
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserProfile":
+        """Create a UserProfile instance from a CouchDB document.
+
+        Enums, injuries and weight history are coerced by the model's own
+        validators in a single model_validate call. The email was validated
+        when the user registered, so it is not re-parsed here.
+        """
+        fields = {k: v for k, v in data.items() if not k.startswith("_")}
+        fields["id"] = data.get("_id", data.get("id"))
+        return cls.model_validate(fields, context={"from_db": True})
 
     class Config:
         json_encoders = {datetime: lambda v: v.isoformat()}
@@ -1,25 +1,115 @@
+import asyncio
+import functools
+import hashlib
 import logging
 import threading
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 import gradio as gr
+from cachetools import TTLCache
 
 from app.config.database import Database
-from app.models.user import UserProfile
 from app.services.hevy_api import HevyAPI
-from app.services.openai_service import OpenAIService
 from app.services.routine_folder_builder import RoutineFolderBuilder
-from app.services.vector_store import ExerciseVectorStore
+from app.state.routine_cache import (
+    cache_routine,
+    get_cached_routine,
+    routine_generation_key,
+)
+from app.state.user_profiles import get_user_profile
+from app.state.vectorstore_status import VECTORSTORE_READY
 from app.utils.formatters import format_routine_markdown
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Initialize services
-db = Database()
-openai_service = OpenAIService()
-vector_store = ExerciseVectorStore()
+db = Database.instance()
+_openai_service = None
+_openai_service_lock = threading.Lock()
+
+# HevyAPI clients keyed by (user id, encrypted key digest) so repeat saves
+# skip decrypting the key; changing the key in the profile gets a new client
+_hevy_clients = {}
+_hevy_clients_lock = threading.Lock()
+
+
+def _get_hevy_api(user_id, encrypted_api_key):
+    """Get or create the HevyAPI client for a user's encrypted API key."""
+    key_digest = hashlib.blake2b(encrypted_api_key.encode(), digest_size=8).hexdigest()
+    with _hevy_clients_lock:
+        hevy_api = _hevy_clients.get((user_id, key_digest))
+        if hevy_api is None:
+            hevy_api = HevyAPI(api_key=encrypted_api_key, is_encrypted=True)
+            _hevy_clients[(user_id, key_digest)] = hevy_api
+    return hevy_api
+
+
+# Last generated routine folder per user, kept out of gr.State so the
+# payload isn't copied around on every event and users don't share one slot
+_generated_routines: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_generated_routines_lock = threading.Lock()
+
+# Users with a routine generation running, so a second tab or session can't
+# start a duplicate set of LLM calls for the same account
+_generations_in_flight = set()
+_generations_in_flight_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=512)
+def _render_profile_summary(
+    experience_level, fitness_goals, workout_days, workout_duration, injuries
+):
+    """Render the profile summary markdown.
+
+    Cached on the values it shows, so an unchanged profile is not rendered
+    again and an edited one never hits a stale entry.
+    """
+    profile_text = f"""
+            **Experience Level:** {experience_level}
+            **Fitness Goals:** {', '.join(fitness_goals)}
+            **Workout Schedule:** {workout_days} days per week
+            **Preferred Duration:** {workout_duration} minutes
+            """
+
+    if injuries:
+        profile_text += "\n**Active Injuries:**"
+        for description, body_part, is_active in injuries:
+            if is_active:
+                profile_text += f"\n- {description} ({body_part})"
+    else:
+        profile_text += "\n**No active injuries**"
+    return profile_text
+
+
+def get_openai_service():
+    """Lazy load the OpenAI service on the first routine generation."""
+    global _openai_service
+    with _openai_service_lock:
+        if _openai_service is None:
+            from app.services.openai_service import OpenAIService
+
+            _openai_service = OpenAIService()
+    return _openai_service
+
+
+def warm_up():
+    """Prepare routine generation so the first click doesn't pay cold-start costs.
+
+    Opens the OpenAI keep-alive connection, then loads the vector store once
+    any startup bootstrap has finished writing to it.
+    """
+    try:
+        service = get_openai_service()
+        service.client.models.list()
+        VECTORSTORE_READY.wait()
+        service.vector_store.vectorstore
+        get_default_title("auto", "week")
+        logger.info("AI recommendations warmed up")
+    except Exception as e:
+        logger.warning("AI recommendations warm-up failed: %s", e)
+
 
 split_type_labels = {
     "auto": "Auto",
@@ -29,7 +119,17 @@ split_type_labels = {
 }
 
 
+# Split headings for the generated routine display
+_SPLIT_DISPLAY = {k: k.replace("_", " ").title() for k in split_type_labels}
+
+
 def get_default_title(split_type, period):
+    return _default_title(split_type, period, datetime.now(timezone.utc).date())
+
+
+@functools.lru_cache(maxsize=64)
+def _default_title(split_type, period, today):
+    """Build the default folder title; cached per day since the range moves."""
     split_label = split_type_labels.get(split_type, split_type.title())
     date_range = RoutineFolderBuilder.get_date_range(period)
     return f"{split_label} - {date_range}"
@@ -91,6 +191,9 @@ def ai_recs_view(state):
             )
 
             generate_btn = gr.Button("Generate Recommendations")
+            # Generating again with unchanged settings shows the plan already
+            # made today; this asks the LLM for a different one
+            regenerate_btn = gr.Button("Generate a Different Plan", variant="secondary")
 
         # Generated Routine Display Section
         with gr.Group():
@@ -105,68 +208,29 @@ def ai_recs_view(state):
         # Add a hidden button for initial data loading
         load_data_btn = gr.Button("Load Data", visible=False)
 
-        loading_messages = [
-            "🧠 Analyzing workout history...",
-            "💡 Generating new exercise plan...",
-            "🔥 Optimizing for strength and recovery...",
-            "⏳ Almost done...",
-        ]
-        # Add state for loading
-        loading_idx = gr.State(0)
-        loading_active = gr.State(False)
-        loading_timer = gr.Timer(value=2.0, active=False)
-
-        def start_loading(*args):
-            # Start loading: set index to 0, active to True, show first message
-            return gr.update(value=loading_messages[0]), 0, True, gr.update(active=True)
-
-        def cycle_loading(idx, active):
-            if not active:
-                return gr.update(), idx  # Don't update if not active
-            next_idx = (idx + 1) % len(loading_messages)
-            return gr.update(value=loading_messages[next_idx]), next_idx
-
-        def generate_routine_llm(user_state, split, period, cardio, title):
-            # This is called after loading starts, and will stop loading when done
+        def _generate_routine_llm(
+            user_state, split, period, cardio, title, progress, show_partial, regenerate
+        ):
             if "id" not in user_state:
-                return (
-                    gr.update(value="Please log in to generate recommendations."),
-                    False,
-                    gr.update(active=False),
-                )
+                return gr.update(value="Please log in to generate recommendations.")
+            if not VECTORSTORE_READY.is_set():
+                return gr.update(value="Warming up, try again in a moment.")
             try:
                 user_id = user_state["id"]
                 if not user_id:
-                    return (
-                        gr.update(value="User ID not found in state"),
-                        False,
-                        gr.update(active=False),
-                    )
-                user_doc = db.get_document(user_id)
-                if not user_doc:
-                    return (
-                        gr.update(value="User profile not found"),
-                        False,
-                        gr.update(active=False),
-                    )
-                user = UserProfile(**user_doc)
+                    return gr.update(value="User ID not found in state")
+                user = get_user_profile(user_id)
+                if not user:
+                    return gr.update(value="User profile not found")
+                units = getattr(user.preferred_units, "value", "imperial")
                 context = {
                     "user_id": user_id,
                     "user_profile": {
                         "experience_level": user.experience_level,
-                        "fitness_goals": [g.value for g in user.fitness_goals],
+                        "fitness_goals": list(user.goal_values),
                         "preferred_workout_duration": user.preferred_workout_duration,
-                        "preferred_units": getattr(
-                            user.preferred_units, "value", "imperial"
-                        ),
-                        "injuries": [
-                            {
-                                "description": i.description,
-                                "body_part": i.body_part,
-                                "is_active": i.is_active,
-                            }
-                            for i in user.injuries
-                        ],
+                        "preferred_units": units,
+                        "injuries": user.injury_dicts,
                         "workout_schedule": {
                             "days_per_week": user.preferred_workout_days,
                         },
@@ -176,49 +240,137 @@ def ai_recs_view(state):
                         "include_cardio": cardio,
                     },
                 }
-                routine_folder = openai_service.generate_routine_folder(
-                    name=title,
-                    description="Personalized workout plan based on your profile and goals",
-                    context=context,
-                    period=period,
-                )
-                if routine_folder:
-                    state["generated_routine"] = routine_folder
-                    display_text = f"## {routine_folder['name']}\n"
-                    display_text += f"*{routine_folder['description']}*\n\n"
-                    display_text += f"**Split Type:** {routine_folder['split_type'].replace('_', ' ').title()}\n"
-                    display_text += (
-                        f"**Days per Week:** {routine_folder['days_per_week']}\n"
+                cache_key = routine_generation_key(user_id, title, period, context)
+                # Regenerating skips the lookup but still stores the new plan
+                routine_folder = None if regenerate else get_cached_routine(cache_key)
+                if routine_folder is None:
+                    partial_parts = []
+
+                    def show_routine(routine):
+                        partial_parts.append("---\n")
+                        partial_parts.append(format_routine_markdown(routine, units))
+                        show_partial("".join(partial_parts))
+
+                    routine_folder = get_openai_service().generate_routine_folder(
+                        name=title,
+                        description="Personalized workout plan based on your profile and goals",
+                        context=context,
+                        period=period,
+                        progress_callback=lambda done, total, desc: progress(
+                            done / total, desc=desc
+                        ),
+                        routine_callback=show_routine,
                     )
-                    display_text += f"**Period:** {routine_folder['period'].title()}\n"
-                    display_text += (
-                        f"**Date Range:** {routine_folder['date_range']}\n\n"
+                    if routine_folder:
+                        cache_routine(cache_key, routine_folder)
+                else:
+                    logger.info("Reusing generated routine folder for user %s", user_id)
+                if routine_folder:
+                    with _generated_routines_lock:
+                        _generated_routines[user_id] = routine_folder
+                    folder_split = routine_folder["split_type"]
+                    split_label = (
+                        _SPLIT_DISPLAY.get(folder_split)
+                        or folder_split.replace("_", " ").title()
                     )
+                    parts = [
+                        f"## {routine_folder['name']}\n",
+                        f"*{routine_folder['description']}*\n\n",
+                        f"**Split Type:** {split_label}\n",
+                        f"**Days per Week:** {routine_folder['days_per_week']}\n",
+                        f"**Period:** {routine_folder['period'].title()}\n",
+                        f"**Date Range:** {routine_folder['date_range']}\n\n",
+                    ]
                     for routine in routine_folder["routines"]:
-                        display_text += "---\n"
-                        display_text += format_routine_markdown(
-                            routine, getattr(user.preferred_units, "value", "imperial")
-                        )
-                    return gr.update(value=display_text), False, gr.update(active=False)
+                        parts.append("---\n")
+                        parts.append(format_routine_markdown(routine, units))
+                    display_text = "".join(parts)
+                    return gr.update(value=display_text)
                 else:
-                    return (
-                        gr.update(
-                            value="Failed to generate routine folder. Please try again."
-                        ),
-                        False,
-                        gr.update(active=False),
+                    return gr.update(
+                        value="Failed to generate routine folder. Please try again."
                     )
             except Exception as e:
-                logger.error(f"Error generating recommendations: {str(e)}")
-                return (
-                    gr.update(value=f"Error generating recommendations: {str(e)}"),
-                    False,
-                    gr.update(active=False),
+                logger.error("Error generating recommendations: %s", e)
+                return gr.update(value=f"Error generating recommendations: {str(e)}")
+
+        async def _stream_routine_generation(
+            user_state, split, period, cardio, title, progress, regenerate
+        ):
+            """Generate a routine folder off Gradio's handler thread pool.
+
+            Generation makes several LLM round trips, so it runs in its own
+            thread instead of holding one of the app's request threads. Each
+            day's routine is shown as soon as it is ready, then replaced by
+            the complete folder.
+            """
+            user_id = user_state.get("id") if isinstance(user_state, dict) else None
+            with _generations_in_flight_lock:
+                already_running = user_id in _generations_in_flight
+                if user_id and not already_running:
+                    _generations_in_flight.add(user_id)
+            if already_running:
+                yield gr.update(
+                    value="A routine is already being generated for your account. Please wait for it to finish."
+                )
+                return
+
+            try:
+                progress(0, desc="🧠 Analyzing workout history...")
+                loop = asyncio.get_running_loop()
+                partials = asyncio.Queue()
+
+                def show_partial(text):
+                    loop.call_soon_threadsafe(partials.put_nowait, text)
+
+                result = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        _generate_routine_llm,
+                        user_state,
+                        split,
+                        period,
+                        cardio,
+                        title,
+                        progress,
+                        show_partial,
+                        regenerate,
+                    )
                 )
+                while True:
+                    next_partial = asyncio.ensure_future(partials.get())
+                    await asyncio.wait(
+                        {result, next_partial}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not next_partial.done():
+                        next_partial.cancel()
+                        break
+                    yield gr.update(value=next_partial.result())
+                yield await result
+            finally:
+                with _generations_in_flight_lock:
+                    _generations_in_flight.discard(user_id)
+
+        async def generate_routine_llm(
+            user_state, split, period, cardio, title, progress=gr.Progress()
+        ):
+            """Generate a routine folder, reusing one made today if unchanged."""
+            async for update in _stream_routine_generation(
+                user_state, split, period, cardio, title, progress, regenerate=False
+            ):
+                yield update
+
+        async def regenerate_routine_llm(
+            user_state, split, period, cardio, title, progress=gr.Progress()
+        ):
+            """Generate a new routine folder even if one was made today."""
+            async for update in _stream_routine_generation(
+                user_state, split, period, cardio, title, progress, regenerate=True
+            ):
+                yield update
 
         def update_ai_recs(user_state):
             """Load and display user data."""
-            logger.info(f"Updating AI Recs")
+            logger.info("Updating AI Recs")
             if "id" not in user_state:
                 return (
                     "Please log in to view recommendations.",
@@ -230,7 +382,7 @@ def ai_recs_view(state):
 
             # Get user document from database
             user_id = user_state["id"]
-            logger.info(f"User ID: {user_id}")
+            logger.info("User ID: %s", user_id)
             if not user_id:
                 return (
                     "User ID not found in state",
@@ -240,9 +392,10 @@ def ai_recs_view(state):
                     "",
                 )
 
-            user_doc = db.get_document(user_id)
-            logger.info(f"User doc: {user_doc}")
-            if not user_doc:
+            # Profile, workout stats and exercise count are fetched concurrently
+            context = db.get_ai_recs_context(user_id, days=30)
+            user = get_user_profile(user_id, context["profile"])
+            if not user:
                 return (
                     "User profile not found",
                     "User profile not found",
@@ -251,37 +404,25 @@ def ai_recs_view(state):
                     "",
                 )
 
-            # Create UserProfile instance
-            user = UserProfile(**user_doc)
-
             # Build profile summary
-            profile_text = f"""
-            **Experience Level:** {user.experience_level}
-            **Fitness Goals:** {', '.join([g.value for g in user.fitness_goals])}
-            **Workout Schedule:** {user.preferred_workout_days} days per week
-            **Preferred Duration:** {user.preferred_workout_duration} minutes
-            """
-
-            if user.injuries:
-                profile_text += "\n**Active Injuries:**"
-                for injury in user.injuries:
-                    if injury.is_active:
-                        profile_text += f"\n- {injury.description} ({injury.body_part})"
-            else:
-                profile_text += "\n**No active injuries**"
+            profile_text = _render_profile_summary(
+                user.experience_level,
+                user.goal_values,
+                user.preferred_workout_days,
+                user.preferred_workout_duration,
+                tuple(
+                    (injury.description, injury.body_part, injury.is_active)
+                    for injury in user.injuries
+                ),
+            )
 
-            # Get user's recent workouts
-            end_date = datetime.now(timezone.utc)
-            start_date = end_date - timedelta(days=30)
-            workouts = db.get_user_workout_history(user_id, start_date, end_date)
+            # Recent workout totals, summed by the workouts/stats view
+            workout_stats = context["workout_stats"]
 
             # Build workout summary
-            if workouts:
-                workout_count = len(workouts)
-                total_exercises = sum(len(w.get("exercises", [])) for w in workouts)
-                avg_exercises = (
-                    total_exercises / workout_count if workout_count > 0 else 0
-                )
+            if workout_stats and workout_stats["total_workouts"]:
+                workout_count = workout_stats["total_workouts"]
+                avg_exercises = workout_stats["total_exercises"] / workout_count
 
                 workout_text = f"""
                 **Workouts in last 30 days:** {workout_count}
@@ -291,8 +432,9 @@ def ai_recs_view(state):
                 workout_text = "**No workouts recorded in the last 30 days**"
 
             # Get available exercises count
-            exercises = db.get_exercises(user_id=user_id, include_custom=True)
-            exercises_text = f"**Total exercises available:** {len(exercises)}"
+            exercises_text = (
+                f"**Total exercises available:** {context['exercise_count']}"
+            )
 
             # Set default routine title
             date_range = RoutineFolderBuilder.get_date_range("week")
@@ -306,7 +448,7 @@ def ai_recs_view(state):
                 "",
             )
 
-        def save_to_hevy(user_state):
+        def _save_to_hevy(user_state):
             """Save generated routine to Hevy."""
             if "id" not in user_state:
                 return "Please log in to save to Hevy."
@@ -317,18 +459,21 @@ def ai_recs_view(state):
                 if not user_id:
                     return "User ID not found in state"
 
-                user_doc = db.get_document(user_id)
-                if not user_doc:
+                user = get_user_profile(user_id)
+                if not user:
                     return "User profile not found"
 
-                user = UserProfile(**user_doc)
-
                 if not user.hevy_api_key:
                     return "Hevy API key is not configured. Please configure it in your profile."
 
-                hevy_api = HevyAPI(api_key=user.hevy_api_key, is_encrypted=True)
+                with _generated_routines_lock:
+                    routine_folder = _generated_routines.get(user_id)
+                if not routine_folder:
+                    return "Please generate a routine before saving to Hevy."
+
+                hevy_api = _get_hevy_api(user_id, user.hevy_api_key)
                 saved_folder = hevy_api.save_routine_folder(
-                    routine_folder=state["generated_routine"],
+                    routine_folder=routine_folder,
                     user_id=user_id,
                     db=db,
                 )
@@ -339,31 +484,43 @@ def ai_recs_view(state):
                     return "Failed to save routine folder to Hevy. Please try again."
 
             except Exception as e:
-                logger.error(f"Error saving to Hevy: {str(e)}")
+                logger.error("Error saving to Hevy: %s", e)
                 return f"Error saving to Hevy: {str(e)}"
 
+        async def save_to_hevy(user_state):
+            """Save generated routine to Hevy without holding a request thread.
+
+            The status shows right away while the folder and its routines are
+            created in a worker thread.
+            """
+            yield "Saving routine folder to Hevy..."
+            yield await asyncio.to_thread(_save_to_hevy, user_state)
+
         def update_title(split_type, period):
             return get_default_title(split_type, period)
 
         # Set up event handlers
         generate_btn.click(
-            fn=start_loading,
-            inputs=[],
-            outputs=[routine_display, loading_idx, loading_active, loading_timer],
-        ).then(
             fn=generate_routine_llm,
             inputs=[state["user_state"], split_type, period, include_cardio, title],
-            outputs=[routine_display, loading_active, loading_timer],
+            outputs=routine_display,
+            # Different users generate side by side; the in-flight guard keeps
+            # each user to one generation at a time
+            concurrency_limit=8,
         )
-        # 2. Timer cycles loading messages
-        loading_timer.tick(
-            fn=cycle_loading,
-            inputs=[loading_idx, loading_active],
-            outputs=[routine_display, loading_idx],
+
+        regenerate_btn.click(
+            fn=regenerate_routine_llm,
+            inputs=[state["user_state"], split_type, period, include_cardio, title],
+            outputs=routine_display,
+            concurrency_limit=8,
         )
 
         save_btn.click(
-            fn=save_to_hevy, inputs=[state["user_state"]], outputs=save_status
+            fn=save_to_hevy,
+            inputs=[state["user_state"]],
+            outputs=save_status,
+            concurrency_limit=4,
         )
 
         # Load initial data when page is shown
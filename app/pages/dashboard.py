@@ -1,19 +1,84 @@
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 
-import dateutil.parser
 import gradio as gr
+from cachetools import TTLCache
 
-from app.config.database import Database
-from app.models.user import UserProfile
+from app.config.database import IO_POOL, Database
 from app.services.sync import sync_hevy_data
-from app.state.sync_status import SYNC_STATUS
+from app.state.sync_status import begin_sync, get_sync_status, set_sync_status
+from app.state.user_profiles import get_user_profile
+from app.utils.streaks import current_streak
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Initialize database connection
-db = Database()
+db = Database.instance()
+
+# Section texts for when no user is logged in, and for the stats, goals and
+# injuries sections when loading fails
+_LOGGED_OUT_TEXTS = (
+    "Please log in to view your dashboard",
+    "### Total Workouts\nPlease log in to view stats",
+    "### Average Workouts per Week\nPlease log in to view stats",
+    "### Last Workout\nPlease log in to view stats",
+    "### Current Streak\nPlease log in to view stats",
+    "### Your Fitness Goals\nPlease log in to view goals",
+    "### Active Injuries\nPlease log in to view injuries",
+)
+_ERROR_SECTION_TEXTS = (
+    "### Total Workouts\nError loading stats",
+    "### Average Workouts per Week\nError loading stats",
+    "### Last Workout\nError loading stats",
+    "### Current Streak\nError loading stats",
+    "### Your Fitness Goals\nError loading goals",
+    "### Active Injuries\nError loading injuries",
+)
+
+
+def _text_updates(*texts):
+    """Build one gr.update per text.
+
+    Gradio pops "value" out of returned update dicts while processing them,
+    so fresh updates are built for every call instead of sharing them.
+    """
+    return tuple(gr.update(value=text) for text in texts)
+
+
+# Dashboard workout numbers keyed by (user id, day), so refreshing the
+# dashboard doesn't re-read them. Short-lived so a sync shows up within
+# minutes.
+_dashboard_bundle_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_dashboard_bundle_cache_lock = threading.Lock()
+
+
+def _get_dashboard_bundle(user_id, now):
+    """Get the user's dashboard workout numbers.
+
+    Args:
+        user_id: The user's ID
+        now: The current time (UTC)
+
+    Returns:
+        Dict from Database.get_dashboard_bundle
+    """
+    key = (user_id, now.date())
+    with _dashboard_bundle_cache_lock:
+        bundle = _dashboard_bundle_cache.get(key)
+    if bundle is None:
+        bundle = db.get_dashboard_bundle(user_id)
+        with _dashboard_bundle_cache_lock:
+            _dashboard_bundle_cache[key] = bundle
+    return bundle
+
+
+def _forget_dashboard_bundle(user_id):
+    """Drop the cached dashboard workout numbers for a user."""
+    with _dashboard_bundle_cache_lock:
+        for key in [k for k in _dashboard_bundle_cache if k[0] == user_id]:
+            del _dashboard_bundle_cache[key]
 
 
 def dashboard_view(state):
@@ -45,47 +110,64 @@ def dashboard_view(state):
             sync_full_btn = gr.Button("Sync Full History")
         sync_status = gr.Markdown("")
         is_syncing = gr.State(False)
-        sync_status_timer = gr.Timer(value=2.0, active=True)
+        # Only ticks while a sync is running; see start_sync and poll_sync_status
+        sync_status_timer = gr.Timer(value=2.0, active=False)
         refresh_needed = gr.State(False)
+        last_sync_status = gr.State("")
 
         # Add a hidden button for initial data loading
         load_data_btn = gr.Button("Load Data", visible=False)
 
         def start_sync(user_state, sync_type):
-            import threading
-
-            from app.services.sync import sync_hevy_data
-
-            if SYNC_STATUS["status"] == "syncing":
-                return "Sync already in progress..."
+            user_id = user_state.get("id")
+            if not user_id:
+                return "Please log in to sync workouts", gr.update()
+            if not begin_sync(user_id):
+                return "Sync already in progress...", gr.update(active=True)
 
             def run_sync():
                 try:
                     sync_hevy_data(user_state, sync_type)
-                    SYNC_STATUS["status"] = "complete"
                 except Exception as e:
                     logger.error(f"Error syncing workouts: {e}", exc_info=True)
-                    SYNC_STATUS["status"] = "error"
+                    set_sync_status(user_id, "error")
 
-            SYNC_STATUS["status"] = "syncing"
             threading.Thread(target=run_sync, daemon=True).start()
-            return "Syncing workouts..."
+            return "Syncing workouts...", gr.update(active=True)
 
-        def poll_sync_status():
-            status = SYNC_STATUS["status"]
+        def poll_sync_status(last_status, user_state):
+            user_id = user_state.get("id")
+            status = get_sync_status(user_id)
+            refresh = False
             if status == "syncing":
-                return gr.update(value="Syncing workouts..."), False
+                status_text = "Syncing workouts..."
             elif status == "complete":
-                SYNC_STATUS["status"] = "idle"
-                return gr.update(value="Sync complete!"), True
+                set_sync_status(user_id, "idle")
+                status_text, refresh = "Sync complete!", True
             elif status == "error":
-                SYNC_STATUS["status"] = "idle"
-                return gr.update(value="Sync failed!"), True
+                set_sync_status(user_id, "idle")
+                status_text, refresh = "Sync failed!", True
             else:
-                return gr.update(value=""), False
+                status_text = ""
+            # Stop polling once no sync is running
+            timer = gr.update() if status == "syncing" else gr.update(active=False)
+            # Skip sending an unchanged status
+            if status_text == last_status and not refresh:
+                return gr.update(), False, last_status, timer
+            return gr.update(value=status_text), refresh, status_text, timer
+
+        def watch_login_sync(user_state):
+            # Logging in starts a sync in the background; poll until it ends
+            if get_sync_status(user_state.get("id")) == "syncing":
+                return gr.update(active=True)
+            return gr.update()
 
         def handle_refresh_change(refresh_flag, user_state):
             if refresh_flag:
+                # A sync just finished: drop the cached workout numbers so
+                # the new workouts show up
+                if "id" in user_state:
+                    _forget_dashboard_bundle(user_state["id"])
                 dashboard_updates = update_dashboard(user_state)
                 # Reset refresh_needed to False after update
                 return (False, *dashboard_updates)
@@ -102,21 +184,7 @@ def dashboard_view(state):
 
             if "id" not in user_state:
                 logger.warning("No user id in user_state")
-                return (
-                    gr.update(value="Please log in to view your dashboard"),
-                    gr.update(value="### Total Workouts\nPlease log in to view stats"),
-                    gr.update(
-                        value="### Average Workouts per Week\nPlease log in to view stats"
-                    ),
-                    gr.update(value="### Last Workout\nPlease log in to view stats"),
-                    gr.update(value="### Current Streak\nPlease log in to view stats"),
-                    gr.update(
-                        value="### Your Fitness Goals\nPlease log in to view goals"
-                    ),
-                    gr.update(
-                        value="### Active Injuries\nPlease log in to view injuries"
-                    ),
-                )
+                return _text_updates(*_LOGGED_OUT_TEXTS)
 
             try:
                 # Get user profile
@@ -124,76 +192,40 @@ def dashboard_view(state):
                 logger.info(f"Extracted user ID: {user_id}")
                 if not user_id:
                     logger.error("No user ID found in state")
-                    return (
-                        gr.update(value="Error: User ID not found in state"),
-                        gr.update(value="### Total Workouts\nError loading stats"),
-                        gr.update(
-                            value="### Average Workouts per Week\nError loading stats"
-                        ),
-                        gr.update(value="### Last Workout\nError loading stats"),
-                        gr.update(value="### Current Streak\nError loading stats"),
-                        gr.update(value="### Your Fitness Goals\nError loading goals"),
-                        gr.update(value="### Active Injuries\nError loading injuries"),
+                    return _text_updates(
+                        "Error: User ID not found in state", *_ERROR_SECTION_TEXTS
                     )
 
-                user_doc = db.get_document(user_id)
-                logger.info(f"Retrieved user document: {bool(user_doc)}")
-                if not user_doc:
+                # The workout numbers and the profile are independent reads,
+                # so fetch them at the same time
+                now = datetime.now(timezone.utc)
+                bundle_future = IO_POOL.submit(_get_dashboard_bundle, user_id, now)
+
+                # Parsed profiles are shared with the other pages and reused
+                # until the document's revision changes
+                user = get_user_profile(user_id)
+                if user is None:
                     logger.error(f"User document not found for ID: {user_id}")
-                    return (
-                        gr.update(value="Error: User profile not found"),
-                        gr.update(value="### Total Workouts\nError loading stats"),
-                        gr.update(
-                            value="### Average Workouts per Week\nError loading stats"
-                        ),
-                        gr.update(value="### Last Workout\nError loading stats"),
-                        gr.update(value="### Current Streak\nError loading stats"),
-                        gr.update(value="### Your Fitness Goals\nError loading goals"),
-                        gr.update(value="### Active Injuries\nError loading injuries"),
+                    return _text_updates(
+                        "Error: User profile not found", *_ERROR_SECTION_TEXTS
                     )
 
-                user = UserProfile.from_dict(user_doc)
+                # Workout counts per day over the user's whole history, from
+                # one view query; totals, recent activity, the last workout
+                # and the streak are all derived from it
+                bundle = bundle_future.result()
+                workout_days = bundle["workout_days"]
+                total_workouts_count = bundle["total_workouts"]
+
+                thirty_days_ago = (now - timedelta(days=30)).date().isoformat()
+                recent_workouts_count = sum(
+                    count
+                    for day, count in workout_days.items()
+                    if day >= thirty_days_ago
+                )
+                avg_workouts_per_week = recent_workouts_count / 4.3  # ~30 days / 7 days
 
-                # Get workout stats for the last 30 days (for recent activity)
-                now = datetime.now(timezone.utc)
-                thirty_days_ago = now - timedelta(days=30)
-                recent_stats = db.get_workout_stats(user_id, thirty_days_ago, now)
-
-                # Get all-time workout stats (for total counts)
-                all_time_stats = db.get_workout_stats(user_id)
-
-                logger.info(f"Recent stats (30 days): {recent_stats}")
-                logger.info(f"All-time stats: {all_time_stats}")
-
-                # Process recent stats (last 30 days)
-                if recent_stats and len(recent_stats) > 0:
-                    recent_data = recent_stats[0]
-                    recent_workouts_count = recent_data.get("total_workouts", 0)
-                    avg_workouts_per_week = (
-                        recent_workouts_count / 4.3
-                    )  # ~30 days / 7 days
-                else:
-                    recent_workouts_count = 0
-                    avg_workouts_per_week = 0.0
-
-                # Process all-time stats (for total counts)
-                if all_time_stats and len(all_time_stats) > 0:
-                    all_time_data = all_time_stats[0]
-                    total_workouts_count = all_time_data.get("total_workouts", 0)
-                    last_workout_date = all_time_data.get("last_workout_date")
-                else:
-                    total_workouts_count = 0
-                    last_workout_date = None
-
-                # Display last workout date from all-time stats
-                if last_workout_date:
-                    try:
-                        dt = dateutil.parser.parse(last_workout_date)
-                        last_workout_str = dt.strftime("%Y-%m-%d")
-                    except:
-                        last_workout_str = "Unknown date"
-                else:
-                    last_workout_str = "No workouts yet"
+                last_workout_str = bundle["last_workout_date"] or "No workouts yet"
 
                 logger.info(f"Total workouts count (all-time): {total_workouts_count}")
                 logger.info(f"Recent workouts count (30 days): {recent_workouts_count}")
@@ -202,51 +234,13 @@ def dashboard_view(state):
                 )
                 logger.info(f"Last workout date: {last_workout_str}")
 
-                # For workout streak, we'd need individual workout data
-                # For now, we'll use a simplified approach
-                all_workouts = []
-
-                # Calculate streak using the set of workout dates
-                dates_with_workouts = set()
-                for w in all_workouts:
-                    dt = w.get("start_time")
-                    if dt:
-                        date_only = dt[:10]  # 'YYYY-MM-DD'
-                        dates_with_workouts.add(date_only)
-
-                logger.info(f"Dates with workouts: {dates_with_workouts}")
-
                 # Calculate streak
                 # TODO: Refactor to robustly handle user timezone
-                # TODO: Refactor to show streaks longer than 30 days
-                streak = 0
-                now = datetime.now(timezone.utc)
-                current_date = now.date() - timedelta(days=1)
-                logger.info(f"Current date: {current_date}")
-                while True:
-                    if current_date.isoformat() in dates_with_workouts:
-                        streak += 1
-                        current_date -= timedelta(days=1)
-                    else:
-                        break
-
-                # Format goals
-                goals_text = "\n".join(
-                    [f"- {goal.value}" for goal in user.fitness_goals]
-                )
+                streak = current_streak(workout_days, now.date())
 
-                # Format active injuries
-                active_injuries = [i for i in user.injuries if i.is_active]
-                injuries_text = (
-                    "\n".join(
-                        [
-                            f"- {injury.description} ({injury.body_part}) - {injury.severity.value} severity"
-                            for injury in active_injuries
-                        ]
-                    )
-                    if active_injuries
-                    else "No active injuries"
-                )
+                # Goals and injuries are formatted once per parsed profile
+                goals_text = user.goals_markdown
+                injuries_text = user.injuries_markdown
 
                 return (
                     gr.update(value=f"# Welcome back, {user.username}! 👋"),
@@ -264,17 +258,7 @@ def dashboard_view(state):
 
             except Exception as e:
                 logger.error(f"Error updating dashboard: {str(e)}", exc_info=True)
-                return (
-                    gr.update(value="Error loading dashboard"),
-                    gr.update(value="### Total Workouts\nError loading stats"),
-                    gr.update(
-                        value="### Average Workouts per Week\nError loading stats"
-                    ),
-                    gr.update(value="### Last Workout\nError loading stats"),
-                    gr.update(value="### Current Streak\nError loading stats"),
-                    gr.update(value="### Your Fitness Goals\nError loading goals"),
-                    gr.update(value="### Active Injuries\nError loading injuries"),
-                )
+                return _text_updates("Error loading dashboard", *_ERROR_SECTION_TEXTS)
 
         # Load initial data when page is shown
         load_data_btn.click(
@@ -295,18 +279,23 @@ def dashboard_view(state):
         sync_recent_btn.click(
             fn=lambda user_state: start_sync(user_state, "recent"),
             inputs=[state["user_state"]],
-            outputs=[sync_status],
+            outputs=[sync_status, sync_status_timer],
         )
         sync_full_btn.click(
             fn=lambda user_state: start_sync(user_state, "full"),
             inputs=[state["user_state"]],
-            outputs=[sync_status],
+            outputs=[sync_status, sync_status_timer],
         )
-        # Poll sync status every 2 seconds using Timer
+        # Poll sync status every 2 seconds while a sync runs
         sync_status_timer.tick(
             fn=poll_sync_status,
-            inputs=[],
-            outputs=[sync_status, refresh_needed],
+            inputs=[last_sync_status, state["user_state"]],
+            outputs=[sync_status, refresh_needed, last_sync_status, sync_status_timer],
+        )
+        state["user_state"].change(
+            fn=watch_login_sync,
+            inputs=[state["user_state"]],
+            outputs=[sync_status_timer],
         )
 
         # When refresh_needed changes to True, update dashboard and reset refresh_needed
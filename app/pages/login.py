@@ -5,7 +5,7 @@ import gradio as gr
 from app.config.database import Database
 from app.models.user import UserProfile
 
-db = Database()
+db = Database.instance()
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +38,7 @@ logger = logging.getLogger(__name__)
 logger.info("Profile module loaded")
 
 # Initialize database connection
-db = Database()
+db = Database.instance()
 
 
 def profile_view(state):
@@ -94,10 +94,14 @@ def profile_view(state):
             with gr.Row():
                 workout_days = gr.Number(
                     label="Preferred Workout Days per Week",
+                    minimum=1,
+                    maximum=7,
                     interactive=True,
                 )
                 workout_duration = gr.Number(
                     label="Preferred Workout Duration (minutes)",
+                    minimum=15,
+                    maximum=240,
                     interactive=True,
                 )
 
@@ -444,6 +448,8 @@ def profile_view(state):
                         days_val = int(preferred_workout_days)
                     except Exception:
                         return gr.update(value="Invalid workout days value")
+                    if not 1 <= days_val <= 7:
+                        return gr.update(value="Workout days must be between 1 and 7")
                     if user.preferred_workout_days != days_val:
                         user.preferred_workout_days = days_val
                         updated = True
@@ -455,6 +461,10 @@ def profile_view(state):
                         duration_val = int(preferred_workout_duration)
                     except Exception:
                         return gr.update(value="Invalid workout duration value")
+                    if not 15 <= duration_val <= 240:
+                        return gr.update(
+                            value="Workout duration must be between 15 and 240 minutes"
+                        )
                     if user.preferred_workout_duration != duration_val:
                         user.preferred_workout_duration = duration_val
                         updated = True
@@ -464,9 +474,9 @@ def profile_view(state):
 
                 if updated:
                     # Save changes
-                    update_doc = user.model_dump()
-                    update_doc["_rev"] = user_doc["_rev"]
-                    db.save_document(update_doc, doc_id=user_id)
+                    db.save_raw(
+                        user.to_json_bytes(), doc_id=user_id, rev=user_doc["_rev"]
+                    )
                     logger.info(f"Successfully saved profile changes: {msg}")
                     # Touch user_state to trigger Gradio change event
                     import datetime as _dt
@@ -534,9 +544,7 @@ def profile_view(state):
                 user.injuries.append(new_injury)
 
                 # Save changes
-                update_doc = user.model_dump()
-                update_doc["_rev"] = user_doc["_rev"]
-                db.save_document(update_doc, doc_id=user_id)
+                db.save_raw(user.to_json_bytes(), doc_id=user_id, rev=user_doc["_rev"])
                 logger.info("Successfully saved injury to user profile")
 
                 return gr.update(value="Injury added successfully")
@@ -575,9 +583,7 @@ def profile_view(state):
                 user.injuries[idx].is_active = not user.injuries[idx].is_active
 
                 # Save changes
-                update_doc = user.model_dump()
-                update_doc["_rev"] = user_doc["_rev"]
-                db.save_document(update_doc, doc_id=user_id)
+                db.save_raw(user.to_json_bytes(), doc_id=user_id, rev=user_doc["_rev"])
                 logger.info(f"Successfully toggled injury {injury_index} active status")
 
                 return gr.update(value="Injury status updated successfully")
@@ -616,9 +622,7 @@ def profile_view(state):
                 del user.injuries[idx]
 
                 # Save changes
-                update_doc = user.model_dump()
-                update_doc["_rev"] = user_doc["_rev"]
-                db.save_document(update_doc, doc_id=user_id)
+                db.save_raw(user.to_json_bytes(), doc_id=user_id, rev=user_doc["_rev"])
                 logger.info(f"Successfully deleted injury {injury_index}")
 
                 return gr.update(value="Injury deleted successfully")
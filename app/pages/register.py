@@ -14,7 +14,7 @@ from app.utils.units import inches_to_cm, lbs_to_kg
 logger = logging.getLogger(__name__)
 
 # Initialize database connection
-db = Database()
+db = Database.instance()
 
 
 def register_view(
@@ -359,8 +359,7 @@ def register_view(
                     injuries=injuries,
                 )
                 # Save to database
-                user_dict = new_user.model_dump()
-                doc_id, doc_rev = db.save_document(user_dict)
+                doc_id, doc_rev = db.save_raw(new_user.to_json_bytes())
                 # Return user object for state management
                 user = {"id": doc_id, "username": username, "email": email}
                 return user, gr.update(visible=False), encrypted_key
@@ -20,7 +20,7 @@ from app.services.sync import sync_hevy_data
 from app.state.sync_status import SYNC_STATUS
 
 logger = logging.getLogger(__name__)
-db = Database()
+db = Database.instance()
 
 
 def handle_session_errors(func):
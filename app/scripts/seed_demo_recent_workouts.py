@@ -62,7 +62,9 @@ def load_hevy_exercise_ids():
         # First try to get exercises from database
         logger.info("Attempting to load exercise IDs from database...")
         db = Database()
-        exercises = db.get_exercises(include_custom=False)  # Only get base exercises
+        exercises = db.get_exercises(
+            include_custom=False, fields={"title", "exercise_template_id", "id"}
+        )  # Only get base exercises
         if exercises:
             # Create mapping from exercise title to ID
             mapping = {}
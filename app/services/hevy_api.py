@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Union
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from app.config.database import Database
 from app.models.exercise import Exercise, ExerciseList
@@ -13,6 +14,11 @@ from app.utils.crypto import decrypt_api_key
 
 logger = logging.getLogger(__name__)
 
+# One HTTP session for every HevyAPI instance so requests reuse keep-alive
+# connections to api.hevyapp.com instead of opening one per call
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 
 class HevyAPI:
     """Service for interacting with the Hevy API."""
@@ -38,6 +44,7 @@ class HevyAPI:
             raise ValueError("Invalid or missing Hevy API key")
 
         self.base_url = "https://api.hevyapp.com/v1"
+        self.session = _SESSION
         self.headers = {
             "Content-Type": "application/json",
             "api-key": self.api_key,
@@ -75,7 +82,7 @@ class HevyAPI:
                 self._rate_limit()
 
                 # Make the request
-                response = requests.request(method, url, **kwargs)
+                response = self.session.request(method, url, **kwargs)
 
                 # If we get a 429 (rate limit), wait and retry
                 if response.status_code == 429:
@@ -298,7 +305,7 @@ class HevyAPI:
         url = f"{self.base_url}/workouts/{workout_id}"
 
         try:
-            response = requests.put(url, headers=self.headers, json=workout_data)
+            response = self.session.put(url, headers=self.headers, json=workout_data)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
@@ -318,7 +325,7 @@ class HevyAPI:
         url = f"{self.base_url}/workouts"
 
         try:
-            response = requests.post(url, headers=self.headers, json=workout_data)
+            response = self.session.post(url, headers=self.headers, json=workout_data)
             response.raise_for_status()
 
             # Extract workout ID from the response
@@ -349,7 +356,7 @@ class HevyAPI:
         url = f"{self.base_url}/routines"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("routines", [])
         except requests.exceptions.RequestException as e:
@@ -416,7 +423,7 @@ class HevyAPI:
             logger.debug(f"Headers: {json.dumps(self.headers, indent=2)}")
             logger.debug(f"Final request data: {json.dumps(routine_data, indent=2)}")
 
-            response = requests.post(url, headers=self.headers, json=routine_data)
+            response = self.session.post(url, headers=self.headers, json=routine_data)
             logger.debug(f"Response status code: {response.status_code}")
             logger.debug(f"Response text: {response.text}")
 
@@ -591,7 +598,7 @@ class HevyAPI:
         url = f"{self.base_url}/routines/{routine_id}"
 
         try:
-            response = requests.put(url, headers=self.headers, json=routine_data)
+            response = self.session.put(url, headers=self.headers, json=routine_data)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
@@ -687,7 +694,7 @@ class HevyAPI:
         url = f"{self.base_url}/exercise_templates/{exercise_id}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -704,7 +711,7 @@ class HevyAPI:
         url = f"{self.base_url}/routine_folders"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("folders", [])
         except requests.exceptions.RequestException as e:
@@ -729,7 +736,7 @@ class HevyAPI:
             logger.info(f"Sending POST request to: {url}")
             logger.debug(f"Headers: {json.dumps(self.headers, indent=2)}")
 
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=self.headers,
                 json=folder_data,
@@ -783,7 +790,7 @@ class HevyAPI:
         url = f"{self.base_url}/routine_folders/{folder_id}"
 
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
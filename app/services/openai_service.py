@@ -5,7 +5,7 @@ import os
 import re
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 import openai
 import requests
@@ -41,7 +41,7 @@ class OpenAIService:
         self.client = OpenAI(api_key=self.api_key)
         self._vector_store = None
         self._hevy_api = None
-        self.db = Database()  # Initialize database connection
+        self.db = Database.instance()  # Shared database connection
 
     @property
     def vector_store(self):
@@ -190,11 +190,9 @@ class OpenAIService:
         # Format injuries for the prompt
         injury_text = (
             ", ".join(
-                [
-                    f"{i['description']} ({i['body_part']})"
-                    for i in injuries
-                    if i.get("is_active", False)
-                ]
+                f"{i['description']} ({i['body_part']})"
+                for i in injuries
+                if i.get("is_active", False)
             )
             if injuries
             else "None"
@@ -212,9 +210,7 @@ class OpenAIService:
             if user_id:
                 from datetime import datetime, timedelta, timezone
 
-                from app.config.database import Database
-
-                db = Database()
+                db = self.db
                 end_date = datetime.now(timezone.utc)
                 start_date = end_date - timedelta(days=30)
                 detailed_workouts = db.get_user_workout_history(
@@ -659,7 +655,13 @@ class OpenAIService:
             return f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d, %Y')}"
 
     def generate_routine_folder(
-        self, name: str, description: str, context: dict, period: str
+        self,
+        name: str,
+        description: str,
+        context: dict,
+        period: str,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        routine_callback: Optional[Callable[[dict], None]] = None,
     ) -> Optional[dict]:
         """Generate a complete workout routine folder using OpenAI.
 
@@ -668,6 +670,10 @@ class OpenAIService:
             description: Description of the routine folder
             context: User context and preferences
             period: Time period for the routines (week or month)
+            progress_callback: Called as (done, total, description) before each
+                day's routine is generated
+            routine_callback: Called with each day's routine as soon as it has
+                been generated, so callers can show partial results
 
         Returns:
             Dictionary containing the routine folder structure
@@ -692,11 +698,33 @@ class OpenAIService:
                 preferred_split=preferred_split,
             )
 
+            # Only generate for the requested number of days
+            day_routines = routines[:days_per_week]
+
+            # Embed every day's exercise and history searches in one request
+            # up front; generate_routine's searches then hit the query cache
+            day_focuses = [routine["focus"] for routine in day_routines]
+            self.vector_store.prefetch_search_embeddings(
+                exercise_queries=[
+                    f"{focus} exercises for {experience_level} level"
+                    for focus in day_focuses
+                ],
+                history_queries=(
+                    [f"{focus} workout routine" for focus in day_focuses]
+                    if context.get("user_id")
+                    else []
+                ),
+            )
+
             # Generate routines for each day
             generated_routines = []
-            for routine in routines[
-                :days_per_week
-            ]:  # Only generate for the requested number of days
+            for index, routine in enumerate(day_routines):
+                if progress_callback:
+                    progress_callback(
+                        index,
+                        len(day_routines),
+                        f"💡 Generating {routine['day']} ({routine['focus']})...",
+                    )
                 # Retry logic for each routine
                 routine_data = None
                 for attempt in range(1, MAX_ATTEMPTS + 1):
@@ -727,6 +755,8 @@ class OpenAIService:
                 routine_data["day"] = routine["day"]
                 routine_data["focus"] = routine["focus"]
                 generated_routines.append(routine_data)
+                if routine_callback:
+                    routine_callback(routine_data)
 
             if not generated_routines:
                 logger.error("Failed to generate any routines")
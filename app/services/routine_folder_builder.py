@@ -2,10 +2,11 @@
 Service for building and formatting routine folders.
 """
 
+import functools
 import json
 import logging
 import os
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from app.config.database import Database
@@ -14,6 +15,19 @@ from app.models.exercise import Exercise, ExerciseList
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _date_range(period: str, start: date) -> str:
+    """Date range string for a period starting on the given day."""
+    if period == "week":
+        end_date = start + timedelta(days=7)
+        return f"{start.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+    elif period == "month":
+        end_date = start + timedelta(days=30)
+        return f"{start.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+    else:
+        raise ValueError(f"Invalid period: {period}")
+
+
 class RoutineFolderBuilder:
     """Service for building and formatting routine folders."""
 
@@ -143,12 +157,4 @@ class RoutineFolderBuilder:
         Returns:
             Date range string
         """
-        now = datetime.now(timezone.utc)
-        if period == "week":
-            end_date = now + timedelta(days=7)
-            return f"{now.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-        elif period == "month":
-            end_date = now + timedelta(days=30)
-            return f"{now.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
-        else:
-            raise ValueError(f"Invalid period: {period}")
+        return _date_range(period, datetime.now(timezone.utc).date())
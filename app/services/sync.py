@@ -5,13 +5,13 @@ from app.config.database import Database
 from app.models.user import UserProfile
 from app.services.hevy_api import HevyAPI
 from app.services.vector_store import ExerciseVectorStore
-from app.state.sync_status import SYNC_STATUS
+from app.state.sync_status import set_sync_status
 from app.utils.crypto import decrypt_api_key
 
 logger = logging.getLogger(__name__)
 
 
-db = Database()
+db = Database.instance()
 vector_store = ExerciseVectorStore()
 
 
@@ -28,26 +28,27 @@ def calculate_duration_minutes(start_time, end_time):
 
 
 def sync_hevy_data(user_state, sync_type="recent"):
+    user_id = user_state.get("id")
     try:
-        SYNC_STATUS["status"] = "syncing"
+        set_sync_status(user_id, "syncing")
         logger.info(
             f"Starting sync process for user: {user_state.get('id', 'unknown')}"
         )
 
         if "id" not in user_state:
             logger.error("No user ID in state")
-            SYNC_STATUS["status"] = "error"
+            set_sync_status(user_id, "error")
             return "No user logged in."
 
         user_doc = db.get_document(user_state["id"])
         if not user_doc:
             logger.error(f"User profile not found for ID: {user_state['id']}")
-            SYNC_STATUS["status"] = "error"
+            set_sync_status(user_id, "error")
             return "User profile not found."
 
         if not user_doc.get("hevy_api_key"):
             logger.error("Hevy API key not configured for user")
-            SYNC_STATUS["status"] = "error"
+            set_sync_status(user_id, "error")
             return "Hevy API key not configured."
 
         # Decrypt API key
@@ -193,25 +194,25 @@ def sync_hevy_data(user_state, sync_type="recent"):
             if enriched_workouts:
                 logger.info(f"Batch saving {len(enriched_workouts)} new workouts...")
                 try:
-                    db.save_workouts_batch(enriched_workouts)
+                    saved_ids = db.save_workouts_batch(enriched_workouts)
                     logger.info(
-                        f"Successfully saved {len(enriched_workouts)} workouts in batch"
+                        f"Successfully saved {len(saved_ids)} workouts in batch"
                     )
                 except Exception as e:
                     logger.error(f"Error batch saving workouts: {e}")
-                    # Fallback to individual saves
+                    # Fallback to individual saves, so one bad workout doesn't
+                    # lose the whole batch
                     logger.info("Falling back to individual workout saves...")
-                    successful_saves = 0
+                    saved_ids = []
                     for workout_data in enriched_workouts:
                         try:
-                            db.save_workout(workout_data)
-                            successful_saves += 1
+                            saved_ids.append(db.save_workout(workout_data))
                         except Exception as individual_error:
                             logger.error(
                                 f"Error saving individual workout {workout_data.get('title')}: {individual_error}"
                             )
-                            skipped_count += 1
-                    new_workouts_count = successful_saves
+                skipped_count += len(enriched_workouts) - len(saved_ids)
+                new_workouts_count = len(saved_ids)
 
             logger.info(
                 f"Sync summary: {new_workouts_count} new workouts, {skipped_count} skipped"
@@ -236,11 +237,11 @@ def sync_hevy_data(user_state, sync_type="recent"):
         # Update last sync timestamp
         db.update_last_sync_timestamp(user_doc["_id"], end_date)
 
-        SYNC_STATUS["status"] = "complete"
+        set_sync_status(user_id, "complete")
         logger.info("Sync process completed successfully")
         return "Sync complete."
 
     except Exception as e:
         logger.error(f"Error during sync process: {e}", exc_info=True)
-        SYNC_STATUS["status"] = "error"
+        set_sync_status(user_id, "error")
         return f"Sync failed: {str(e)}"
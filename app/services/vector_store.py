@@ -5,11 +5,13 @@ Vector store service for the AI Personal Trainer application.
 import json
 import logging
 import os
+import threading
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional
 
 import numpy as np
+from cachetools import LRUCache
 from dotenv import load_dotenv
 from langchain.embeddings import CacheBackedEmbeddings
 from langchain.storage import LocalFileStore
@@ -24,6 +26,25 @@ from app.models.exercise import Exercise, ExerciseList
 logger = logging.getLogger(__name__)
 
 
+# Query vectors keyed by query text; routine generation repeats the same
+# few queries, and misses are embedded together in one API call
+_query_embeddings: LRUCache = LRUCache(maxsize=1024)
+_query_embeddings_lock = threading.Lock()
+
+_GENERAL_CATEGORIES = {"arms", "legs", "back", "chest", "shoulders", "core"}
+
+
+def _exercise_search_text(query: str) -> str:
+    """Standardize an exercise search query to the muscle-group text format."""
+    if "Primary muscles:" in query:
+        return query
+    if query.lower() in _GENERAL_CATEGORIES:
+        # For general categories, only search primary muscles
+        return f"Primary muscles: {query}"
+    # For specific muscles, search both primary and secondary
+    return f"Primary muscles: {query} OR Secondary muscles: {query}"
+
+
 class ExerciseVectorStore:
     """Service for managing exercise embeddings and similarity search."""
 
@@ -58,6 +79,50 @@ class ExerciseVectorStore:
             logger.info("Initialized embeddings with caching")
         return self._embeddings
 
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query, reusing the vector for repeated queries."""
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several search queries with at most one embeddings request.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            One vector per text, in order
+        """
+        with _query_embeddings_lock:
+            found = {t: _query_embeddings[t] for t in texts if t in _query_embeddings}
+        missing = [t for t in dict.fromkeys(texts) if t not in found]
+        if missing:
+            # Queries and documents share one embeddings endpoint; calling the
+            # underlying model keeps query vectors out of the on-disk cache
+            vectors = self.embeddings.underlying_embeddings.embed_documents(missing)
+            found.update(zip(missing, vectors))
+            with _query_embeddings_lock:
+                for text, vector in zip(missing, vectors):
+                    _query_embeddings[text] = vector
+        return [found[t] for t in texts]
+
+    def prefetch_search_embeddings(
+        self, exercise_queries: List[str], history_queries: Optional[List[str]] = None
+    ) -> None:
+        """Embed upcoming exercise and workout history searches in one request.
+
+        Args:
+            exercise_queries: Queries that will be passed to search_exercises
+            history_queries: Queries that will be passed to search_workout_history
+        """
+        try:
+            self.embed_queries(
+                [_exercise_search_text(q) for q in exercise_queries]
+                + list(history_queries or [])
+            )
+        except Exception as e:
+            # The searches embed on their own if the batch fails
+            logger.warning(f"Error prefetching query embeddings: {str(e)}")
+
     @property
     def vectorstore(self):
         """Lazy load the vector store."""
@@ -232,24 +297,8 @@ class ExerciseVectorStore:
             List[Dict]: List of exercise dictionaries
         """
         try:
-            # Check if this is a general category search
-            is_general_category = query.lower() in [
-                "arms",
-                "legs",
-                "back",
-                "chest",
-                "shoulders",
-                "core",
-            ]
-
             # Standardize the query format
-            if "Primary muscles:" not in query:
-                if is_general_category:
-                    # For general categories, only search primary muscles
-                    query = f"Primary muscles: {query}"
-                else:
-                    # For specific muscles, search both primary and secondary
-                    query = f"Primary muscles: {query} OR Secondary muscles: {query}"
+            query = _exercise_search_text(query)
 
             # Convert filter criteria to ChromaDB format
             where = {}
@@ -260,10 +309,12 @@ class ExerciseVectorStore:
             logger.info(f"Filter criteria: {where}")
 
             # Perform similarity search
-            results = self.vectorstore.similarity_search_with_score(
-                query=query,
-                k=k,
-                filter=where if where else None,
+            results = (
+                self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                    embedding=self.embed_query(query),
+                    k=k,
+                    filter=where if where else None,
+                )
             )
 
             logger.info(f"Found {len(results)} results")
@@ -699,10 +750,14 @@ class ExerciseVectorStore:
         """
         try:
             # Perform similarity search with user filter
-            results = self.vectorstore.similarity_search_with_score(
-                query=query,
-                k=k,
-                filter={"$and": [{"user_id": user_id}, {"type": "workout_history"}]},
+            results = (
+                self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                    embedding=self.embed_query(query),
+                    k=k,
+                    filter={
+                        "$and": [{"user_id": user_id}, {"type": "workout_history"}]
+                    },
+                )
             )
 
             logger.info(f"Found {len(results)} similar workouts")
@@ -780,7 +835,7 @@ class ExerciseVectorStore:
 
             # Load custom exercises from database
             logger.info(f"Loading custom exercises for user {user_id}...")
-            db = Database()
+            db = Database.instance()
             custom_exercises = db.get_custom_exercises(user_id)
 
             if custom_exercises:
@@ -0,0 +1,33 @@
+# app/state/routine_cache.py
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+import orjson
+from cachetools import TTLCache
+
+# Generated routine folders keyed by user, request digest and day, so
+# generating again with an unchanged profile and settings skips the LLM calls.
+# The day is part of the key because the plan's date range moves with it.
+_routine_generation_cache: TTLCache = TTLCache(maxsize=1024, ttl=24 * 3600)
+_routine_generation_cache_lock = threading.Lock()
+
+
+def routine_generation_key(user_id, title, period, context):
+    """Build the generation cache key for a routine request."""
+    payload = orjson.dumps(context, default=str, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.sha256(payload).hexdigest()
+    today = datetime.now(timezone.utc).date()
+    return (user_id, title, period, today, digest)
+
+
+def get_cached_routine(cache_key):
+    """Get the routine folder generated for a request today, if any."""
+    with _routine_generation_cache_lock:
+        return _routine_generation_cache.get(cache_key)
+
+
+def cache_routine(cache_key, routine_folder):
+    """Remember a generated routine folder; replaces any earlier one."""
+    with _routine_generation_cache_lock:
+        _routine_generation_cache[cache_key] = routine_folder
@@ -1,2 +1,35 @@
-# app/sync_status.py
-SYNC_STATUS = {"status": "idle"}
+# app/state/sync_status.py
+import threading
+
+# Sync status per user id: "syncing", "complete" or "error". Users without an
+# entry are idle, so one user's sync never blocks or shows up for another.
+SYNC_STATUS = {}
+SYNC_STATUS_LOCK = threading.Lock()
+
+
+def get_sync_status(user_id):
+    """Get a user's sync status."""
+    with SYNC_STATUS_LOCK:
+        return SYNC_STATUS.get(user_id, "idle")
+
+
+def set_sync_status(user_id, status):
+    """Set a user's sync status; "idle" drops the entry."""
+    with SYNC_STATUS_LOCK:
+        if status == "idle":
+            SYNC_STATUS.pop(user_id, None)
+        else:
+            SYNC_STATUS[user_id] = status
+
+
+def begin_sync(user_id):
+    """Mark a user as syncing.
+
+    Returns:
+        False if a sync is already running for the user, True otherwise
+    """
+    with SYNC_STATUS_LOCK:
+        if SYNC_STATUS.get(user_id) == "syncing":
+            return False
+        SYNC_STATUS[user_id] = "syncing"
+        return True
@@ -0,0 +1,38 @@
+# app/state/user_profiles.py
+import threading
+
+from cachetools import TTLCache
+
+from app.config.database import Database
+from app.models.user import UserProfile
+
+# Parsed profiles keyed by (user id, revision), shared by every page. Profile
+# saves and syncs change the revision, so stale entries are never returned and
+# simply expire.
+_user_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_user_cache_lock = threading.Lock()
+
+
+def get_user_profile(user_id, user_doc=None):
+    """Get the UserProfile for a user, reusing the parsed model across callbacks.
+
+    Args:
+        user_id: User ID
+        user_doc: The user document, if already fetched
+
+    Returns:
+        UserProfile, or None if the user document does not exist
+    """
+    if user_doc is None:
+        user_doc = Database.instance().get_document(user_id)
+    if not user_doc:
+        return None
+
+    key = (user_id, user_doc.get("_rev"))
+    with _user_cache_lock:
+        user = _user_cache.get(key)
+    if user is None:
+        user = UserProfile.from_dict(user_doc)
+        with _user_cache_lock:
+            _user_cache[key] = user
+    return user
@@ -0,0 +1,7 @@
+# app/state/vectorstore_status.py
+import threading
+
+# Set while the vector store can serve queries; cleared during the startup
+# bootstrap in production and set again when it finishes
+VECTORSTORE_READY = threading.Event()
+VECTORSTORE_READY.set()
@@ -1,5 +1,9 @@
 import logging
 
+from app.utils.units import convert_weight_for_display, get_weight_unit_label
+
+logger = logging.getLogger(__name__)
+
 
 def format_routine_markdown(
     routine: dict, user_preferred_units: str = "imperial"
@@ -13,15 +17,10 @@ def format_routine_markdown(
     Returns:
         Formatted markdown string
     """
-    logger = logging.getLogger(__name__)
-
-    # Import unit conversion functions
-    from app.utils.units import convert_weight_for_display, get_weight_unit_label
-
     # Get weight unit label for display
     weight_unit = get_weight_unit_label(user_preferred_units)
     # Log the keys present in the routine data
-    logger.info(f"Routine data keys: {list(routine.keys())}")
+    logger.debug(f"Routine data keys: {list(routine.keys())}")
 
     if not routine or "hevy_api" not in routine or "routine" not in routine["hevy_api"]:
         return "Invalid routine format"
@@ -32,28 +31,28 @@ def format_routine_markdown(
     routine_name = (
         routine_data.get("name") or routine_data.get("title") or "Untitled Routine"
     )
-    markdown = f"## {routine_name}\n\n"
+    parts = [f"## {routine_name}\n\n"]
     if "notes" in routine_data and routine_data["notes"]:
-        markdown += f"*{routine_data['notes']}*\n\n"
+        parts.append(f"*{routine_data['notes']}*\n\n")
 
     # Add each exercise
     for exercise in routine_data.get("exercises", []):
-        logger.info(f"Exercise keys: {list(exercise.keys())}")
+        logger.debug(f"Exercise keys: {list(exercise.keys())}")
         exercise_name = (
             exercise.get("name") or exercise.get("title") or "Unknown Exercise"
         )
-        markdown += f"### {exercise_name}\n"
+        parts.append(f"### {exercise_name}\n")
 
         # Add exercise description if available
         if "exercise_description" in exercise and exercise["exercise_description"]:
-            markdown += f"{exercise['exercise_description']}\n\n"
+            parts.append(f"{exercise['exercise_description']}\n\n")
 
         # Add exercise notes if available
         if "notes" in exercise and exercise["notes"]:
-            markdown += f"*{exercise['notes']}*\n\n"
+            parts.append(f"*{exercise['notes']}*\n\n")
 
         # Add sets
-        markdown += "**Sets:**\n"
+        parts.append("**Sets:**\n")
         for i, set_data in enumerate(exercise.get("sets", []), 1):
             set_type = set_data.get("type", "normal").capitalize()
             reps = set_data.get("reps", "N/A")
@@ -88,12 +87,12 @@ def format_routine_markdown(
             if duration:
                 set_info.append(duration)
 
-            markdown += f"{i}. {set_type}: {', '.join(set_info)}\n"
+            parts.append(f"{i}. {set_type}: {', '.join(set_info)}\n")
 
         # Add rest time if specified
         if "rest_seconds" in exercise and exercise["rest_seconds"]:
-            markdown += f"*Rest: {exercise['rest_seconds']} seconds*\n\n"
+            parts.append(f"*Rest: {exercise['rest_seconds']} seconds*\n\n")
         else:
-            markdown += "\n"
+            parts.append("\n")
 
-    return markdown
+    return "".join(parts)
@@ -0,0 +1,26 @@
+from datetime import date, timedelta
+
+
+def current_streak(workout_days, today):
+    """Count the consecutive days with workouts, ending yesterday.
+
+    Args:
+        workout_days: Workout count per YYYY-MM-DD day, in date order
+        today: Today's date
+
+    Returns:
+        Length of the streak in days
+    """
+    streak = 0
+    expected = today - timedelta(days=1)
+    # Days are sorted, so walk back from the latest and stop at the first gap;
+    # only the days in the streak get parsed
+    for day in reversed(workout_days):
+        workout_date = date.fromisoformat(day)
+        if workout_date >= today:
+            continue
+        if workout_date != expected:
+            break
+        streak += 1
+        expected -= timedelta(days=1)
+    return streak
@@ -0,0 +1,195 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from cachetools import TTLCache
+
+from app.config.database import Database, _stats_from_sums
+
+
+@pytest.fixture
+def db():
+    # Skip __init__ so no CouchDB connection is made
+    database = Database.__new__(Database)
+    database.db = MagicMock()
+    return database
+
+
+def view_row(key, value):
+    return SimpleNamespace(key=key, value=value)
+
+
+def test_get_workout_days_reads_grouped_count_rows(db):
+    # Arrange: _count reduce with group_level=2 gives one row per day
+    db.db.view.return_value = [
+        view_row(["user-1", "2025-06-01"], 1),
+        view_row(["user-1", "2025-06-03"], 2),
+    ]
+    start = datetime(2025, 6, 1, 8, tzinfo=timezone.utc)
+    end = datetime(2025, 6, 30, 20, tzinfo=timezone.utc)
+
+    # Act
+    days = db.get_workout_days("user-1", start, end)
+
+    # Assert
+    assert days == {"2025-06-01": 1, "2025-06-03": 2}
+    db.db.view.assert_called_once_with(
+        "workouts/by_user_day",
+        startkey=["user-1", "2025-06-01"],
+        endkey=["user-1", "2025-06-30"],
+        group_level=2,
+    )
+
+
+def test_get_workout_days_without_range_reads_all_history(db):
+    db.db.view.return_value = []
+
+    assert db.get_workout_days("user-1") == {}
+    _, kwargs = db.db.view.call_args
+    assert kwargs["startkey"] == ["user-1"]
+    assert kwargs["endkey"] == ["user-1", {}]
+
+
+def test_get_dashboard_bundle_totals_day_counts(db):
+    db.db.view.return_value = [
+        view_row(["user-1", "2025-05-30"], 1),
+        view_row(["user-1", "2025-06-02"], 3),
+    ]
+
+    bundle = db.get_dashboard_bundle("user-1")
+
+    assert bundle["total_workouts"] == 4
+    assert bundle["last_workout_date"] == "2025-06-02"
+    assert list(bundle["workout_days"]) == ["2025-05-30", "2025-06-02"]
+
+
+def test_get_dashboard_bundle_without_workouts(db):
+    db.db.view.return_value = []
+
+    bundle = db.get_dashboard_bundle("user-1")
+
+    assert bundle == {
+        "total_workouts": 0,
+        "last_workout_date": None,
+        "workout_days": {},
+    }
+
+
+def test_save_workouts_batch_updates_existing_workouts(db):
+    # Arrange: one workout is already stored under an older generated id
+    db.db.view.return_value = [
+        view_row(
+            "hevy-1",
+            {"_id": "abc123", "_rev": "3-x", "created_at": "2025-01-01T00:00:00"},
+        )
+    ]
+    db.db.update.return_value = [
+        (True, "abc123", "4-y"),
+        (True, "workout_hevy-2", "1-z"),
+    ]
+    workouts = [
+        {"hevy_id": "hevy-1", "user_id": "user-1", "title": "Push"},
+        {"hevy_id": "hevy-2", "user_id": "user-1"},
+    ]
+
+    # Act
+    saved = db.save_workouts_batch(workouts)
+
+    # Assert
+    assert saved == ["abc123", "workout_hevy-2"]
+    db.db.view.assert_called_once_with("workouts/by_hevy_id", keys=["hevy-1", "hevy-2"])
+    updated, created = db.db.update.call_args[0][0]
+    assert (updated["_id"], updated["_rev"]) == ("abc123", "3-x")
+    assert updated["created_at"] == "2025-01-01T00:00:00"
+    assert created["_id"] == "workout_hevy-2"
+    assert "_rev" not in created
+    assert created["title"] == ""
+
+
+def test_get_existing_workout_ids_confirms_known_hits(db, monkeypatch):
+    # Arrange: the known set still has a workout that was deleted since
+    known = {"hevy-1", "hevy-2"}
+    monkeypatch.setattr(Database, "_known_workout_hevy_ids", known)
+    db.db.view.return_value = [view_row("hevy-1", {})]
+
+    # Act
+    existing = db.get_existing_workout_ids(["hevy-1", "hevy-2", "hevy-3"])
+
+    # Assert
+    assert existing == {"hevy-1"}
+    assert known == {"hevy-1"}
+    _, kwargs = db.db.view.call_args
+    assert sorted(kwargs["keys"]) == ["hevy-1", "hevy-2"]
+
+
+def test_stats_from_sums_names_summed_values():
+    stats = _stats_from_sums([4, 12, 40, 2500.0, 320, 180.5])
+
+    assert stats == {
+        "total_workouts": 4,
+        "total_exercises": 12,
+        "total_sets": 40,
+        "total_weight": 2500.0,
+        "total_reps": 320,
+        "total_duration": 180.5,
+    }
+
+
+def test_stats_from_sums_rejects_old_view_values():
+    # The pre-_sum view reduced to a dict
+    with pytest.raises(ValueError, match="update_db_views"):
+        _stats_from_sums({"total_workouts": 4})
+
+
+@pytest.fixture
+def empty_doc_cache(monkeypatch):
+    monkeypatch.setattr(Database, "_doc_cache", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(Database, "_doc_cache_keys", {})
+    monkeypatch.setattr(Database, "_exercise_cache", TTLCache(maxsize=16, ttl=60))
+
+
+def test_doc_cache_returns_copies(db, empty_doc_cache):
+    doc = {"_id": "user_1", "tags": ["a"]}
+    db._cache_set(("doc", "user_1"), doc)
+
+    # Mutating the original or a returned copy leaves the cache intact
+    doc["tags"].append("b")
+    cached = db._cache_get(("doc", "user_1"))
+    cached["tags"].append("c")
+
+    assert db._cache_get(("doc", "user_1")) == {"_id": "user_1", "tags": ["a"]}
+
+
+def test_invalidate_cached_drops_every_key_for_a_document(db, empty_doc_cache):
+    user = {"_id": "user_1", "username": "tester"}
+    db._cache_set(("doc", "user_1"), user)
+    db._cache_set(("username", "tester"), user)
+    db._cache_set(("doc", "user_2"), {"_id": "user_2"})
+
+    db._invalidate_cached("user_1", None)
+
+    assert db._cache_get(("doc", "user_1")) is None
+    assert db._cache_get(("username", "tester")) is None
+    assert db._cache_get(("doc", "user_2")) == {"_id": "user_2"}
+
+
+def test_doc_cache_index_is_rebuilt_from_live_entries(db, empty_doc_cache):
+    # More documents than the cache holds leave evicted ids in the index
+    for n in range(40):
+        db._cache_set(("doc", f"user_{n}"), {"_id": f"user_{n}"})
+
+    live_ids = {doc["_id"] for doc in Database._doc_cache.values()}
+    assert len(Database._doc_cache_keys) <= 2 * Database._doc_cache.maxsize
+    assert live_ids <= set(Database._doc_cache_keys)
+
+    db._invalidate_cached("user_39")
+    assert db._cache_get(("doc", "user_39")) is None
+
+
+def test_invalidate_cached_clears_resolved_exercises(db, empty_doc_cache):
+    Database._exercise_cache["base_exercises"] = [{"id": "ex"}]
+
+    db._invalidate_cached("exercise_123")
+
+    assert len(Database._exercise_cache) == 0
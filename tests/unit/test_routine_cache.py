@@ -0,0 +1,77 @@
+import pytest
+from cachetools import TTLCache
+
+from app.state import routine_cache
+from app.state.routine_cache import (
+    cache_routine,
+    get_cached_routine,
+    routine_generation_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(
+        routine_cache, "_routine_generation_cache", TTLCache(maxsize=16, ttl=60)
+    )
+
+
+@pytest.fixture
+def context():
+    return {
+        "user_id": "user_1",
+        "user_profile": {
+            "experience_level": "intermediate",
+            "fitness_goals": ["strength"],
+            "injuries": [],
+            "workout_schedule": {"days_per_week": 3},
+        },
+        "generation_preferences": {"split_type": "auto", "include_cardio": True},
+    }
+
+
+def test_unchanged_request_hits_the_cache(context):
+    folder = {"name": "Plan"}
+    cache_routine(routine_generation_key("user_1", "Plan", "week", context), folder)
+
+    # Same profile and settings, built from a fresh dict
+    key = routine_generation_key("user_1", "Plan", "week", dict(context))
+
+    assert get_cached_routine(key) == folder
+
+
+def test_changed_profile_misses_the_cache(context):
+    cache_routine(
+        routine_generation_key("user_1", "Plan", "week", context), {"name": "Plan"}
+    )
+
+    context["user_profile"]["injuries"] = [
+        {"description": "Knee pain", "body_part": "Knee", "severity": "mild"}
+    ]
+    key = routine_generation_key("user_1", "Plan", "week", context)
+
+    assert get_cached_routine(key) is None
+
+
+def test_changed_settings_miss_the_cache(context):
+    cache_routine(
+        routine_generation_key("user_1", "Plan", "week", context), {"name": "Plan"}
+    )
+
+    assert (
+        get_cached_routine(routine_generation_key("user_1", "Plan", "month", context))
+        is None
+    )
+    assert (
+        get_cached_routine(routine_generation_key("user_2", "Plan", "week", context))
+        is None
+    )
+
+
+def test_regenerated_plan_replaces_the_cached_one(context):
+    key = routine_generation_key("user_1", "Plan", "week", context)
+    cache_routine(key, {"name": "Plan", "version": 1})
+
+    cache_routine(key, {"name": "Plan", "version": 2})
+
+    assert get_cached_routine(key) == {"name": "Plan", "version": 2}
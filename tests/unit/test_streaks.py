@@ -0,0 +1,33 @@
+from datetime import date
+
+from app.utils.streaks import current_streak
+
+TODAY = date(2025, 6, 10)
+
+
+def test_streak_counts_consecutive_days_ending_yesterday():
+    days = {"2025-06-07": 1, "2025-06-08": 2, "2025-06-09": 1}
+
+    assert current_streak(days, TODAY) == 3
+
+
+def test_workout_today_does_not_count_or_break_the_streak():
+    days = {"2025-06-08": 1, "2025-06-09": 1, "2025-06-10": 1}
+
+    assert current_streak(days, TODAY) == 2
+
+
+def test_gap_yesterday_means_no_streak():
+    days = {"2025-06-07": 1, "2025-06-08": 1, "2025-06-10": 1}
+
+    assert current_streak(days, TODAY) == 0
+
+
+def test_streak_stops_at_first_gap():
+    days = {"2025-06-01": 1, "2025-06-02": 1, "2025-06-08": 1, "2025-06-09": 1}
+
+    assert current_streak(days, TODAY) == 2
+
+
+def test_no_workouts_means_no_streak():
+    assert current_streak({}, TODAY) == 0
@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.user import FitnessGoal, InjurySeverity, Sex, UserProfile
+
+
+@pytest.fixture
+def stored_doc():
+    user = UserProfile.create_user(
+        username="tester",
+        email="tester@example.com",
+        password="secret",
+        height_cm=180,
+        weight_kg=80,
+        sex=Sex.MALE,
+        age=30,
+        fitness_goals=[FitnessGoal.STRENGTH],
+        experience_level="beginner",
+        rounds=4,
+    )
+    doc = user.model_dump()
+    doc["_id"] = user.id
+    doc["_rev"] = "1-abc"
+    return doc
+
+
+def test_from_dict_clamps_out_of_range_stored_values(stored_doc):
+    # Arrange: saved before age/days/duration were bounded
+    stored_doc.update(age=150, preferred_workout_days=0, preferred_workout_duration=300)
+
+    # Act
+    user = UserProfile.from_dict(stored_doc)
+
+    # Assert
+    assert user.age == 120
+    assert user.preferred_workout_days == 1
+    assert user.preferred_workout_duration == 240
+
+
+def test_new_profiles_still_validate_bounds(stored_doc):
+    stored_doc.update(age=150)
+    stored_doc.pop("_id")
+    stored_doc.pop("_rev")
+
+    with pytest.raises(ValidationError):
+        UserProfile(**stored_doc)
+
+
+def test_from_dict_wraps_legacy_weight_history(stored_doc):
+    # Arrange: old documents stored bare weights or ISO date strings
+    stored_doc["weight_history"] = [
+        81.5,
+        {"weight": 80.0, "date": "2025-06-01T08:00:00+00:00"},
+        {"weight": 79.0, "date": "not a date"},
+    ]
+
+    # Act
+    user = UserProfile.from_dict(stored_doc)
+
+    # Assert
+    bare, dated, bad_date = user.weight_history
+    assert bare == {"weight": 81.5, "date": None}
+    assert dated["date"] == datetime(2025, 6, 1, 8, tzinfo=timezone.utc)
+    assert bad_date["date"] is None
+
+
+def test_from_dict_parses_stored_injuries(stored_doc):
+    stored_doc["injuries"] = [
+        {
+            "description": "Left knee pain",
+            "body_part": "Left knee",
+            "severity": "moderate",
+            "date_injured": "2025-05-01T00:00:00+00:00",
+        },
+        {
+            "description": "Old shoulder strain",
+            "body_part": "Shoulder",
+            "severity": "mild",
+            "date_injured": "2024-01-01T00:00:00+00:00",
+            "is_active": False,
+            "notes": "Healed",
+        },
+    ]
+
+    user = UserProfile.from_dict(stored_doc)
+
+    knee, shoulder = user.injuries
+    assert knee.severity is InjurySeverity.MODERATE
+    assert knee.is_active
+    assert knee.date_injured == datetime(2025, 5, 1, tzinfo=timezone.utc)
+    assert not shoulder.is_active
+    assert user.injuries_markdown == (
+        "- Left knee pain (Left knee) - moderate severity"
+    )
+
+
+def test_from_dict_uses_document_id(stored_doc):
+    stored_doc["_id"] = "user_123"
+
+    assert UserProfile.from_dict(stored_doc).id == "user_123"
+
+
+def test_verify_password_checks_the_stored_hash(stored_doc):
+    user = UserProfile.from_dict(stored_doc)
+
+    assert user.verify_password("secret")
+    assert not user.verify_password("wrong-password")